@@ -1,13 +1,19 @@
 """925r API v2 tests."""
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APITestCase
 from rest_assured import testcases
 from ninetofiver import factories, models
+from ninetofiver.renderers import ORJSONRenderer
 from ninetofiver.tests import ModelTestMixin, AuthenticatedAPITestCase
+from django.test import SimpleTestCase
 from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
 from django.shortcuts import reverse
+from decimal import Decimal
 import tempfile
 import datetime
+import uuid
 
 
 class GenericViewTests(AuthenticatedAPITestCase):
@@ -39,6 +45,45 @@ class GenericViewTests(AuthenticatedAPITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
 
+class ORJSONRendererTests(SimpleTestCase):
+    """orjson renderer tests."""
+
+    data = {
+        'decimal': Decimal('1234.50'),
+        'lazy': _('Total'),
+        'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'datetime': datetime.datetime(2020, 2, 3, 4, 5, 6, 789123, tzinfo=datetime.timezone.utc),
+        'naive_datetime': datetime.datetime(2020, 2, 3, 4, 5, 6),
+        'date': datetime.date(2020, 2, 3),
+        'time': datetime.time(4, 5, 6, 7),
+        'nested': [{1: 'caf\u00e9 \u2028'}, None, True, 1.5],
+    }
+
+    def test_render(self):
+        """Test whether the output matches DRF's JSON renderer."""
+        self.assertEqual(ORJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_render_indented(self):
+        """Test whether indented output matches DRF's JSON renderer."""
+        self.assertEqual(ORJSONRenderer().render(self.data, renderer_context={'indent': 4}),
+                         JSONRenderer().render(self.data, renderer_context={'indent': 4}))
+        self.assertEqual(ORJSONRenderer().render(self.data, 'application/json; indent=2'),
+                         JSONRenderer().render(self.data, 'application/json; indent=2'))
+
+    def test_render_none(self):
+        """Test rendering no data."""
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_render_non_finite_numbers(self):
+        """Test whether NaN and infinite numbers are refused like DRF's JSON renderer does."""
+        for value in (float('nan'), float('inf'), Decimal('-Infinity')):
+            data = {'nested': [{'value': value}]}
+            with self.assertRaises(ValueError):
+                JSONRenderer().render(data)
+            with self.assertRaises(ValueError):
+                ORJSONRenderer().render(data)
+
+
 class ApiKeyAuthenticationTests(APITestCase):
     """API key authentication tests."""
 
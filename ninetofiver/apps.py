@@ -6,3 +6,10 @@ class NineToFiverConfig(AppConfig):
 
     def ready(self):
         import ninetofiver.signals # noqa
+
+        # Resolve the configured DRF classes once at startup instead of on the first request
+        from django.conf import settings
+        from rest_framework.settings import api_settings
+        for key in settings.REST_FRAMEWORK:
+            if key in api_settings.import_strings:
+                getattr(api_settings, key)
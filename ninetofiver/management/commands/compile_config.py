@@ -0,0 +1,44 @@
+"""Compile the YAML configuration file to a Python module."""
+import datetime
+import yaml
+from django.core.management.base import BaseCommand, CommandError
+from ninetofiver import settings
+from ninetofiver.utils import get_compiled_cfg_file_path
+
+
+class Command(BaseCommand):
+    """Compile the YAML configuration file to a Python module which is faster to load."""
+
+    args = ''
+    help = 'Compile the YAML configuration file to a Python module which is faster to load'
+    requires_system_checks = []
+
+    def handle(self, *args, **options):
+        """Compile the YAML configuration file to a Python module which is faster to load."""
+        try:
+            with open(settings.CFG_FILE_PATH, 'r') as f:
+                data = yaml.safe_load(f) or {}
+        except (OSError, yaml.YAMLError) as e:
+            raise CommandError('Could not read %s: %s' % (settings.CFG_FILE_PATH, e))
+
+        py_path = get_compiled_cfg_file_path(settings.CFG_FILE_PATH)
+        lines = [
+            '"""Generated from %s on %s, do not edit."""' % (settings.CFG_FILE_PATH, datetime.date.today()),
+            'import datetime  # noqa',
+            '',
+        ]
+        # Only keep the keys the settings loader would pick up from the YAML file
+        lines += ['%s = %r' % (key, value) for key, value in data.items()
+                  if isinstance(key, str) and key.isupper() and key.isidentifier()]
+        source = '\n'.join(lines) + '\n'
+
+        # Make sure the module can be loaded again, values such as inf or nan have no valid repr
+        try:
+            exec(compile(source, py_path, 'exec'), {})
+        except Exception as e:
+            raise CommandError('Could not compile %s to valid Python: %s' % (settings.CFG_FILE_PATH, e))
+
+        with open(py_path, 'w') as f:
+            f.write(source)
+
+        self.stdout.write('Wrote %s' % py_path)
@@ -11,6 +11,7 @@ class Command(BaseCommand):
 
     args = ''
     help = 'Create a new Timesheet for every active user'
+    requires_system_checks = []
 
     def handle(self, *args, **options):
         """Create a new timesheet for the current month for each user."""
@@ -15,6 +15,7 @@ class Command(BaseCommand):
 
     args = ""
     help = "Send a reminder about birthdays and work anniversaries."
+    requires_system_checks = []
 
     def handle(self, *args, **options):
         """Send a reminder about birthdays and work anniversaries."""
@@ -20,6 +20,7 @@ class Command(BaseCommand):
 
     args = ''
     help = 'Send a reminder about due active timesheets'
+    requires_system_checks = []
 
     def handle(self, *args, **options):
         """Send a reminder about due active timesheets."""
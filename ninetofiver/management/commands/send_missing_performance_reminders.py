@@ -21,6 +21,7 @@ class Command(BaseCommand):
 
     args = ''
     help = 'Send a reminder about working days with missing performance'
+    requires_system_checks = []
 
     def handle(self, *args, **options):
         """Send a reminder about working days with missing performance."""
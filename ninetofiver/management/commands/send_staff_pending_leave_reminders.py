@@ -17,6 +17,7 @@ class Command(BaseCommand):
 
     args = ""
     help = "Send staff a reminder about pending leave"
+    requires_system_checks = []
 
     def handle(self, *args, **options):
         """Send staff a reminder about pending leave."""
@@ -0,0 +1,55 @@
+"""Renderers."""
+import math
+from decimal import Decimal
+
+import orjson
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+
+def _has_non_finite_number(data):
+    """Check whether the given data contains NaN or infinite numbers, which orjson silently writes as null."""
+    values = [data]
+    while values:
+        value = values.pop()
+        if isinstance(value, dict):
+            values.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            values.extend(value)
+        elif isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, Decimal):
+            if not value.is_finite():
+                return True
+    return False
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """JSON renderer using orjson, falling back to DRF's encoder for types orjson doesn't support."""
+
+    encoder = encoders.JSONEncoder()
+    # Dates and times are passed on to DRF's encoder, which formats them differently than orjson (e.g. "Z" for UTC)
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render data to JSON."""
+        if data is None:
+            return b''
+
+        # orjson can't indent by arbitrary amounts, write ASCII-only or spaced out output, or handle NaN and
+        # infinite numbers the way DRF does (writing them or raising in strict mode), so leave those to DRF's renderer
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if (indent is not None or self.ensure_ascii or not self.compact or not self.strict
+                or _has_non_finite_number(data)):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self.encoder.default, option=self.options)
+
+        # Escape these like DRF's renderer does, so the output is a strict JavaScript subset
+        ret = ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+        if self.charset and self.charset.lower() not in ('utf-8', 'utf8'):
+            ret = ret.decode().encode(self.charset)
+
+        return ret
@@ -9,14 +9,19 @@ https://docs.djangoproject.com/en/1.10/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/1.10/ref/settings/
 """
+import functools
+import importlib.util
 import ldap
+import logging
 import os
 import yaml
 
-from configurations import Configuration, values
+from configurations import Configuration
 from django_auth_ldap.config import LDAPSearch
 from django_auth_ldap.config import LDAPSearchUnion
-from ninetofiver.utils import get_django_environment
+from ninetofiver.utils import get_compiled_cfg_file_path, get_django_environment
+
+logger = logging.getLogger(__name__)
 
 CFG_FILE_PATH = os.path.expanduser(os.environ.get('CFG_FILE_PATH', '/etc/925r/config.yml'))
 
@@ -26,6 +31,90 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 ENVIRONMENT = get_django_environment()
 
+# Whether apps which aren't needed by short-lived processes (e.g. management
+# commands run from cron) should be left out to speed up startup
+FAST_STARTUP = os.getenv('FAST_STARTUP', '0') == '1'
+FAST_STARTUP_EXCLUDED_APPS = (
+    'silk',
+    'wkhtmltopdf',
+    'django_tables2',
+    'django_select2',
+    'import_export',
+    'recurrence',
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _read_cfg_file(path):
+    """
+    Read and parse a configuration file once, returning None if it's missing or invalid.
+
+    A Python module generated from the YAML file using the compile_config command is
+    preferred while the YAML file exists and isn't newer than it, since loading it is a
+    lot cheaper than parsing YAML. If it can't be loaded, the YAML file is parsed instead.
+    """
+    py_path = get_compiled_cfg_file_path(path)
+
+    try:
+        use_compiled = os.path.getmtime(py_path) >= os.path.getmtime(path)
+    except OSError:
+        use_compiled = False
+
+    if use_compiled:
+        try:
+            spec = importlib.util.spec_from_file_location('_ninetofiver_cfg', py_path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        except Exception as e:
+            logger.warning('Could not load compiled configuration file %s, using %s instead: %s', py_path, path, e)
+        else:
+            return {key: value for key, value in vars(module).items() if key.isupper()}
+
+    try:
+        with open(path, 'r') as f:
+            # https://github.com/yaml/pyyaml/wiki/PyYAML-yaml.load(input)-Deprecation
+            return yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+    except (OSError, yaml.YAMLError):
+        return None
+
+
+def _env_value(name, default=None, cast=None):
+    """Get a setting value from its environment variable, prefixed like django-configurations does."""
+    value = os.environ.get('DJANGO_{}'.format(name))
+
+    if value is None:
+        return default
+
+    return cast(value) if cast else value
+
+
+def _to_bool(value):
+    """Convert an environment variable value to a boolean."""
+    return value.strip().lower() in ('true', 'yes', 'y', 'on', '1')
+
+
+# REST framework
+_REST_FRAMEWORK = {
+    'DEFAULT_PERMISSION_CLASSES': ('rest_framework.permissions.IsAdminUser',),
+    'DEFAULT_AUTHENTICATION_CLASSES': (
+        'oauth2_provider.contrib.rest_framework.OAuth2Authentication',
+        'rest_framework.authentication.SessionAuthentication',
+        'rest_framework.authentication.BasicAuthentication',
+        'ninetofiver.authentication.ApiKeyAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_FILTER_BACKENDS': (
+        'django_filters.rest_framework.DjangoFilterBackend',
+    ),
+    'EXCEPTION_HANDLER': 'ninetofiver.exceptions.exception_handler',
+    'TEST_REQUEST_DEFAULT_FORMAT': 'json',
+    'DEFAULT_PAGINATION_CLASS': 'ninetofiver.pagination.CustomizablePageNumberPagination',
+    'PAGE_SIZE': 25,
+}
+
 
 class Base(Configuration):
     """Base configuration."""
@@ -38,18 +127,13 @@ class Base(Configuration):
 
     @classmethod
     def _load_cfg_file(cls):
-        data = None
-
-        try:
-            with open(CFG_FILE_PATH, 'r') as f:
-                # https://github.com/yaml/pyyaml/wiki/PyYAML-yaml.load(input)-Deprecation
-                data = yaml.safe_load(f)
-        except BaseException:
-            pass
+        data = _read_cfg_file(CFG_FILE_PATH)
 
         if data:
+            # Django only picks up uppercase names as settings
             for key, value in data.items():
-                setattr(cls, key, value)
+                if key.isupper():
+                    type.__setattr__(cls, key, value)
 
     @classmethod
     def _process_cfg(cls):
@@ -63,7 +147,7 @@ class Base(Configuration):
     # SECURITY WARNING: don't run with debug turned on in production!
     DEBUG = False
 
-    ALLOWED_HOSTS = ['localhost']
+    ALLOWED_HOSTS = ('localhost',)
 
     # Apps included here will be included
     # in the test suite
@@ -72,14 +156,20 @@ class Base(Configuration):
         'ninetofiver.api_v2'
     ]
 
+    # Third-party apps which are only used by the admin interface
+    ADMIN_ONLY_APPS = [
+        'dal',
+        'dal_select2',
+        'rangefilter',
+        'django_admin_listfilter_dropdown',
+        'admin_auto_filters',
+        'logentry_admin',
+    ]
+
     # Application definition
     INSTALLED_APPS = [
         'whitenoise.runserver_nostatic',
-    ] + NINETOFIVER_APPS + [
-        # deprecated in django 2.0, replaced by django_select2
-        # 'django_admin_select2',
-        'dal',
-        'dal_select2',
+    ] + NINETOFIVER_APPS + ADMIN_ONLY_APPS + [
         'django.contrib.admin',
         'django.contrib.auth',
         'django.contrib.contenttypes',
@@ -87,7 +177,6 @@ class Base(Configuration):
         'django.contrib.messages',
         'django.contrib.staticfiles',
         'rest_framework',
-        'rest_framework_swagger',
         'django_filters',
         'rest_framework_filters',
         'corsheaders',
@@ -96,9 +185,6 @@ class Base(Configuration):
         'crispy_forms',
         'django_gravatar',
         'django_countries',
-        'rangefilter',
-        'django_admin_listfilter_dropdown',
-        'admin_auto_filters',
         'silk',
         'wkhtmltopdf',
         'django_tables2',
@@ -106,10 +192,12 @@ class Base(Configuration):
         'phonenumber_field',
         'import_export',
         'adminsortable',
-        'logentry_admin',
         'recurrence'
     ]
 
+    if FAST_STARTUP:
+        INSTALLED_APPS = [x for x in INSTALLED_APPS if x not in FAST_STARTUP_EXCLUDED_APPS]
+
     MIDDLEWARE = [
         'silk.middleware.SilkyMiddleware',
         'corsheaders.middleware.CorsMiddleware',
@@ -123,6 +211,9 @@ class Base(Configuration):
         'django.middleware.clickjacking.XFrameOptionsMiddleware',
     ]
 
+    if FAST_STARTUP:
+        MIDDLEWARE = [x for x in MIDDLEWARE if not x.startswith('silk.')]
+
     ROOT_URLCONF = 'ninetofiver.urls'
 
     TEMPLATES = [
@@ -208,58 +299,14 @@ class Base(Configuration):
     STATIC_URL = '/static/'
 
     # User-uploaded files
-    MEDIA_ROOT = values.Value(os.path.join(BASE_DIR, 'media/'))
+    MEDIA_ROOT = _env_value('MEDIA_ROOT', os.path.join(BASE_DIR, 'media/'))
 
     # Auth
     LOGIN_URL = 'login'
     LOGOUT_URL = 'logout'
 
     # REST framework
-    REST_FRAMEWORK = {
-        'DEFAULT_PERMISSION_CLASSES': ('rest_framework.permissions.IsAdminUser',),
-        'DEFAULT_AUTHENTICATION_CLASSES': (
-            'oauth2_provider.contrib.rest_framework.OAuth2Authentication',
-            'rest_framework.authentication.SessionAuthentication',
-            'rest_framework.authentication.BasicAuthentication',
-            'ninetofiver.authentication.ApiKeyAuthentication',
-        ),
-        'DEFAULT_RENDERER_CLASSES': (
-            'rest_framework.renderers.JSONRenderer',
-            'rest_framework.renderers.BrowsableAPIRenderer',
-        ),
-        'DEFAULT_FILTER_BACKENDS': (
-            'django_filters.rest_framework.DjangoFilterBackend',
-        ),
-        'EXCEPTION_HANDLER': 'ninetofiver.exceptions.exception_handler',
-        'TEST_REQUEST_DEFAULT_FORMAT': 'json',
-        'DEFAULT_PAGINATION_CLASS': 'ninetofiver.pagination.CustomizablePageNumberPagination',
-        'PAGE_SIZE': 25,
-    }
-
-    # Swagger
-    SWAGGER_SETTINGS = {
-        'SECURITY_DEFINITIONS': {
-            # 'basic': {
-            #     'type': 'basic'
-            # },
-            # 'primary': {
-            #     'type': 'oauth2',
-            #     'flow': 'implicit',
-            #     'tokenUrl': '/oauth/v2/token',
-            #     'authorizationUrl': '/oauth/v2/authorize',
-            #     'scopes': {
-            #         'write': 'Write data',
-            #         'read': 'Read data',
-            #     }
-            # },
-        },
-        'DOC_EXPANSION': 'list',
-        'SHOW_REQUEST_HEADERS': True,
-        'JSON_EDITOR': False,
-        # 'APIS_SORTER': 'alpha',
-        # 'OPERATIONS_SORTER': 'method',
-        'VALIDATOR_URL': None,
-    }
+    REST_FRAMEWORK = _REST_FRAMEWORK
 
     # Profiling
     SILKY_AUTHENTICATION = True  # User must login
@@ -285,11 +332,11 @@ class Base(Configuration):
     CORS_ORIGIN_ALLOW_ALL = True
 
     # Exported settings available in templates
-    SETTINGS_EXPORT = [
+    SETTINGS_EXPORT = (
         'DEBUG',
         'REGISTRATION_OPEN',
         'BASE_URL',
-    ]
+    )
 
     # Authentication using LDAP
     AUTHENTICATION_BACKENDS = [
@@ -325,29 +372,33 @@ class Base(Configuration):
     }
 
     # REDMINE
-    REDMINE_URL = values.Value(None)
-    REDMINE_API_KEY = values.Value(None)
-    REDMINE_ISSUE_CONTRACT_FIELD = values.Value('925r_contract')
+    REDMINE_URL = _env_value('REDMINE_URL', None)
+    REDMINE_API_KEY = _env_value('REDMINE_API_KEY', None)
+    REDMINE_ISSUE_CONTRACT_FIELD = _env_value('REDMINE_ISSUE_CONTRACT_FIELD', '925r_contract')
 
-    EMAIL_HOST = values.Value('localhost')
-    EMAIL_PORT = values.Value(25)
-    EMAIL_BACKEND = values.Value('django.core.mail.backends.smtp.EmailBackend')
-    DEFAULT_FROM_EMAIL = values.Value('noreply@example.org')
+    EMAIL_HOST = _env_value('EMAIL_HOST', 'localhost')
+    EMAIL_PORT = _env_value('EMAIL_PORT', 25, int)
+    EMAIL_BACKEND = _env_value('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+    DEFAULT_FROM_EMAIL = _env_value('DEFAULT_FROM_EMAIL', 'noreply@example.org')
 
     # Absolute URL generation without request info
-    BASE_URL = values.Value('http://localhost:8000')
+    BASE_URL = _env_value('BASE_URL', 'http://localhost:8000')
     # Default starting hour for working days
     DEFAULT_WORKING_DAY_STARTING_HOUR = 9
 
     # Mattermost integration
-    MATTERMOST_INCOMING_WEBHOOK_URL = values.Value(None)
-    MATTERMOST_PERFORMANCE_REMINDER_NOTIFICATION_ENABLED = values.Value(True)
-    MATTERMOST_TIMESHEET_REMINDER_NOTIFICATION_ENABLED = values.Value(True)
+    MATTERMOST_INCOMING_WEBHOOK_URL = _env_value('MATTERMOST_INCOMING_WEBHOOK_URL', None)
+    MATTERMOST_PERFORMANCE_REMINDER_NOTIFICATION_ENABLED = _env_value(
+        'MATTERMOST_PERFORMANCE_REMINDER_NOTIFICATION_ENABLED', True, _to_bool)
+    MATTERMOST_TIMESHEET_REMINDER_NOTIFICATION_ENABLED = _env_value(
+        'MATTERMOST_TIMESHEET_REMINDER_NOTIFICATION_ENABLED', True, _to_bool)
 
     # Rocketchat integration
-    ROCKETCHAT_INCOMING_WEBHOOK_URL = values.Value(None)
-    ROCKETCHAT_PERFORMANCE_REMINDER_NOTIFICATION_ENABLED = values.Value(True)
-    ROCKETCHAT_TIMESHEET_REMINDER_NOTIFICATION_ENABLED = values.Value(True)
+    ROCKETCHAT_INCOMING_WEBHOOK_URL = _env_value('ROCKETCHAT_INCOMING_WEBHOOK_URL', None)
+    ROCKETCHAT_PERFORMANCE_REMINDER_NOTIFICATION_ENABLED = _env_value(
+        'ROCKETCHAT_PERFORMANCE_REMINDER_NOTIFICATION_ENABLED', True, _to_bool)
+    ROCKETCHAT_TIMESHEET_REMINDER_NOTIFICATION_ENABLED = _env_value(
+        'ROCKETCHAT_TIMESHEET_REMINDER_NOTIFICATION_ENABLED', True, _to_bool)
 
 
 class Dev(Base):
@@ -363,7 +414,7 @@ class Dev(Base):
 
     DEBUG = True
 
-    ALLOWED_HOSTS = ['*']
+    ALLOWED_HOSTS = ('*',)
 
     # Database
     # https://docs.djangoproject.com/en/1.10/ref/settings/#databases
@@ -433,7 +484,8 @@ class Dev(Base):
 
     CACHES = {
         'default': {
-            'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'ninetofiver-dev',
         }
     }
 
@@ -448,6 +500,30 @@ class Dev(Base):
 class Prod(Base):
     """Prod configuration."""
 
+    # Caching
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL', 'redis://redis:6379/1'),
+        }
+    }
+
+    # REST framework, without the browsable API
+    REST_FRAMEWORK = {
+        **_REST_FRAMEWORK,
+        'DEFAULT_RENDERER_CLASSES': (
+            'ninetofiver.renderers.ORJSONRenderer',
+        ),
+    }
+
+    # Sessions
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
+
+    # Static files
+    # Compressed (gzip, and brotli when available) and hashed during collectstatic,
+    # hashed files are served by whitenoise with a far-future expiry
+    STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+
     # Logging
     LOGGING = {
         'version': 1,
@@ -473,5 +549,5 @@ class Prod(Base):
     }
 
 
-class Stag(Prod):
-    """Stag configuration."""
+# Stag configuration, identical to Prod
+Stag = Prod
@@ -2,10 +2,11 @@
 from django_auth_ldap.backend import populate_user
 from django.contrib.auth import models as auth_models
 from django.dispatch import receiver
-from django.db.models.signals import post_save, pre_save, m2m_changed, pre_delete
+from django.core.cache import cache
+from django.db.models.signals import post_save, pre_save, m2m_changed, pre_delete, post_delete
 from django.utils.translation import gettext_lazy as _
 from ninetofiver import models, notifications
-from ninetofiver.utils import send_mail, get_users_with_permission
+from ninetofiver.utils import send_mail, get_users_with_permission, LEAVE_TYPE_NAMES_CACHE_KEY
 
 
 @receiver(populate_user)
@@ -39,6 +40,13 @@ def on_user_post_save(sender, instance, created=False, **kwargs):
         user_info.save()
 
 
+@receiver(post_save, sender=models.LeaveType)
+@receiver(post_delete, sender=models.LeaveType)
+def on_leave_type_changed(sender, instance, **kwargs):
+    """Invalidate the cached leave type names when a leave type changes."""
+    cache.delete(LEAVE_TYPE_NAMES_CACHE_KEY)
+
+
 @receiver(pre_save, sender=models.Leave)
 def on_leave_pre_save(sender, instance, created=False, **kwargs):
     """Process pre-save event for a leave."""
@@ -1,22 +1,62 @@
 """Tables."""
 import uuid
+from bisect import bisect_right
+from functools import lru_cache
+from urllib.parse import urlencode
 from datetime import timedelta, date, datetime
 
 import django_tables2 as tables
-import humanize
+import orjson
 import six
+from django.conf import settings
 from django.template import Context, Template
 from django.template.loader import get_template
 from django.urls import reverse
-from django.utils.html import format_html, strip_tags
+from django.utils.functional import cached_property
+from django.utils.html import format_html, format_html_join, strip_tags
+from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
 from django_tables2.export.export import TableExport
 from django_tables2.utils import A
 
 from ninetofiver import models
-from ninetofiver.utils import month_date_range, format_duration, dates_in_range
+from ninetofiver.utils import month_date_range, format_duration, dates_in_range, get_leave_type_names
 from math import floor
 
+
+@lru_cache(maxsize=None)
+def _get_cached_template_from_code(template_code):
+    """Compile template code once instead of for every rendered cell."""
+    return Template(template_code)
+
+
+@lru_cache(maxsize=64)
+def _get_cached_template(template_name):
+    """Load a template by name once instead of for every rendered cell."""
+    return get_template(template_name)
+
+
+def _get_template_from_code(template_code):
+    """Compile template code, only caching the result when templates aren't being reloaded (DEBUG is off)."""
+    return Template(template_code) if settings.DEBUG else _get_cached_template_from_code(template_code)
+
+
+def _get_template(template_name):
+    """Load a template by name, only caching the result when templates aren't being reloaded (DEBUG is off)."""
+    return get_template(template_name) if settings.DEBUG else _get_cached_template(template_name)
+
+
+@lru_cache(maxsize=None)
+def _reverse(viewname):
+    """Reverse a URL without arguments once instead of for every rendered row."""
+    return reverse(viewname)
+
+
+def _buttons(*buttons, separator='&nbsp;'):
+    """Join the given safe button HTML snippets, leaving out empty ones."""
+    return mark_safe(separator.join(button for button in buttons if button))
+
+
 class TemplateMixin(object):
     """
     Inspired by TemplateColumn, this can be used to add wrapping template to any column as mixin.
@@ -84,14 +124,14 @@ class TemplateMixin(object):
         post_html = ""
         try:
             if self.pre_template_code:
-                pre_html = Template(self.pre_template_code).render(context)
+                pre_html = _get_template_from_code(self.pre_template_code).render(context)
             elif self.pre_template_name:
-                pre_html = get_template(self.pre_template_name).render(context.flatten())
+                pre_html = _get_template(self.pre_template_name).render(context.flatten())
 
             if self.post_template_code:
-                post_html = Template(self.post_template_code).render(context)
+                post_html = _get_template_from_code(self.post_template_code).render(context)
             elif self.post_template_name:
-                pre_html = get_template(self.post_template_name).render(context.flatten())
+                post_html = _get_template(self.post_template_name).render(context.flatten())
         finally:
             context.pop()
 
@@ -106,6 +146,25 @@ class TemplateMixin(object):
             return html
 
 
+class CachedTemplateColumn(tables.TemplateColumn):
+    """Template column which compiles or loads its template once instead of for every rendered cell."""
+
+    def render(self, record, table, value, bound_column, **kwargs):
+        context = getattr(table, 'context', Context())
+        additional_context = {
+            'default': bound_column.default,
+            'column': bound_column,
+            'record': record,
+            'value': value,
+            'row_counter': kwargs['bound_row'].row_counter,
+        }
+        additional_context.update(self.extra_context)
+        with context.update(additional_context):
+            if self.template_code:
+                return _get_template_from_code(self.template_code).render(context)
+            return _get_template(self.template_name).render(context.flatten())
+
+
 class BaseTable(tables.Table):
     """Base table."""
 
@@ -121,6 +180,32 @@ class BaseTable(tables.Table):
         template_name = 'django_tables2/bootstrap4.html'
         attrs = {'class': 'table table-bordered table-striped table-hover', 'container': 'table-responsive'}
 
+    @cached_property
+    def materialized_data(self):
+        """All records of the table as a list, so footers iterating them don't each re-evaluate the data."""
+        return list(self.data)
+
+    @cached_property
+    def column_totals(self):
+        """Totals of all summed columns, computed in a single pass over the records instead of one per column."""
+        resolvers = [(bound_column.name, bound_column.accessor.resolve) for bound_column in self.columns.iterall()
+                     if isinstance(bound_column.column, SummedColumnMixin)]
+        totals = dict.fromkeys([name for name, resolve in resolvers], 0)
+        for record in self.materialized_data:
+            for name, resolve in resolvers:
+                value = resolve(record)
+                if value is not None:
+                    totals[name] += value
+        return totals
+
+
+class SummedColumnMixin(object):
+    """Mixin for columns showing the total of their values in the footer."""
+
+    def get_total(self, table, bound_column):
+        """Get the total of the column's values."""
+        return table.column_totals.get(bound_column.name, 0)
+
 
 class HoursColumn(tables.Column):
     """Hours column."""
@@ -139,6 +224,11 @@ class HoursColumn(tables.Column):
         return value
 
 
+def _format_euro(value):
+    """Format the given amount in euros with thousands separators, keeping its decimals as they are."""
+    return '€ {:,}'.format(value or 0)
+
+
 class EuroColumn(tables.Column):
     """Euro column."""
 
@@ -146,9 +236,9 @@ class EuroColumn(tables.Column):
 
     def render(self, value):
         if value:
-            return '€ {}'.format(humanize.intcomma(value))
+            return _format_euro(value)
         else:
-            return format_html('<span style="color:#999;">{}</span>', '€ {}'.format(humanize.intcomma(value)))
+            return format_html('<span style="color:#999;">{}</span>', _format_euro(value))
 
     def value(self, value):
         return value
@@ -182,6 +272,9 @@ class InvoiceColoredEuroColumn(TemplateMixin, EuroColumn):
     attrs = {'td': {'align': 'right', 'class': determine_invoiced_cell_color, 'style': determine_invoiced_style}}
 
 
+BAR_CHART_COLORS = (('#FE4365', '#F02311'), ('#CAE8A2', '#7FAF1B'))
+
+
 class BarChartComparisonColumn(tables.TemplateColumn):
     """Bar chart comparison column."""
 
@@ -195,80 +288,105 @@ class BarChartComparisonColumn(tables.TemplateColumn):
 
         super().__init__(**kwargs)
 
-    def render(self, record, table, value, bound_column, **kwargs):
-        self.extra_context['uniqueId'] = str(uuid.uuid4())
-
-        for item in self.extra_context['dataset']:
-            if item.get('accessor', None):
-                item['value'] = item['accessor'].resolve(record)
+        # Everything but the values and the (possibly lazy) labels is the same for every chart, so only determine
+        # it once
+        self._chart_datasets = [{
+            'label': item['label'],
+            'backgroundColor': BAR_CHART_COLORS[i % len(BAR_CHART_COLORS)][0],
+            'borderColor': BAR_CHART_COLORS[i % len(BAR_CHART_COLORS)][1],
+            'borderWidth': 1,
+        } for i, item in enumerate(dataset)]
+        self._accessors = [item.get('accessor', None) for item in dataset]
+        self._static_values = [None if item.get('accessor', None) else item.get('value') for item in dataset]
 
-        self.extra_context['title'] = '%s vs. %s: %s' % (self.extra_context['dataset'][0]['label'],
-                                                         self.extra_context['dataset'][1]['label'],
-                                                         ('%s%%' % round((self.extra_context['dataset'][0]['value'] / self.extra_context['dataset'][1]['value']) * 100, 2)
-                                                          if self.extra_context['dataset'][1]['value'] else 'n/a'))
+    def render(self, record, table, value, bound_column, **kwargs):
+        values = [accessor.resolve(record) if accessor else static_value
+                  for accessor, static_value in zip(self._accessors, self._static_values)]
 
-        return super().render(record, table, value, bound_column, **kwargs)
+        return self._render_chart(table, values, default=bound_column.default, column=bound_column, record=record,
+                                  value=value, row_counter=kwargs['bound_row'].row_counter)
 
     def value(self, record, table, value, bound_column, **kwargs):
         return bound_column.accessor.resolve(record)
 
     def render_footer(self, table, column, bound_column, **kwargs):
-        self.extra_context['uniqueId'] = str(uuid.uuid4())
-
-        for item in self.extra_context['dataset']:
-            if item.get('accessor', None):
-                item['value'] = sum([item['accessor'].resolve(record) for record in table.data])
-
-        self.extra_context['title'] = 'Total: %s vs. %s: %s' % (self.extra_context['dataset'][0]['label'],
-                                                                self.extra_context['dataset'][1]['label'],
-                                                                ('%s%%' % round((self.extra_context['dataset'][0]['value'] / self.extra_context['dataset'][1]['value']) * 100, 2)
-                                                                 if self.extra_context['dataset'][1]['value'] else 'n/a'))
-
-        return super().render(None, table, None, bound_column, bound_row=tables.rows.BoundRow(None, table))
+        # Sum up all dataset values in a single pass over the data
+        resolvers = [(i, accessor.resolve) for i, accessor in enumerate(self._accessors) if accessor]
+        values = [0 if accessor else static_value
+                  for accessor, static_value in zip(self._accessors, self._static_values)]
+        for record in table.materialized_data:
+            for i, resolve in resolvers:
+                value = resolve(record)
+                if value is not None:
+                    values[i] += value
+
+        return self._render_chart(table, values, title_prefix='Total: ', default=bound_column.default,
+                                  column=bound_column)
+
+    def _render_chart(self, table, values, title_prefix='', **additional_context):
+        """Render the chart for the given values of the dataset items without touching the shared extra context."""
+        # Labels may be lazy translations, so only turn them into strings at render time
+        labels = [str(chart_dataset['label']) for chart_dataset in self._chart_datasets]
+        title = '%s%s vs. %s: %s' % (title_prefix, labels[0], labels[1],
+                                     '%s%%' % round((values[0] / values[1]) * 100, 2) if values[1] else 'n/a')
+        datasets_json = orjson.dumps([dict(chart_dataset, label=label, data=[value])
+                                      for chart_dataset, label, value in zip(self._chart_datasets, labels, values)],
+                                     default=float).decode().replace('<', '\\u003c')
+
+        # Render with the table's context like TemplateColumn does, if the table is being rendered using
+        # `render_table`
+        context = getattr(table, 'context', Context())
+        additional_context.update(self.extra_context)
+        additional_context.update({
+            'uniqueId': str(uuid.uuid4()),
+            'title': title,
+            'datasets_json': datasets_json,
+        })
+        with context.update(additional_context):
+            return _get_template(self.template_name).render(context.flatten())
 
 
-class SummedHoursColumn(HoursColumn):
+class SummedHoursColumn(SummedColumnMixin, HoursColumn):
     """Summed hours column."""
 
     def render_footer(self, table, column, bound_column):
         """Render the footer."""
-        accessor = self.accessor if self.accessor else A(bound_column.name)
-        total = [accessor.resolve(x) for x in table.data]
-        total = sum([x for x in total if x is not None])
+        total = self.get_total(table, bound_column)
         return format_html(_('Total: {}'), self.render(total))
 
 
-class SummedEuroColumn(EuroColumn):
+class SummedEuroColumn(SummedColumnMixin, EuroColumn):
     """Summed euro column."""
 
     def render_footer(self, table, column, bound_column):
         """Render the footer."""
-        accessor = self.accessor if self.accessor else A(bound_column.name)
-        total = [accessor.resolve(x) for x in table.data]
-        total = sum([x for x in total if x is not None])
+        total = self.get_total(table, bound_column)
         return format_html(_('<div align="right">Total: {}</div>'), self.render(total))
 
 
-class SummedInvoiceColoredEuroColumn(InvoiceColoredEuroColumn):
+class SummedInvoiceColoredEuroColumn(SummedColumnMixin, InvoiceColoredEuroColumn):
     """Summed euro column."""
 
     def render_footer(self, table, column, bound_column):
         """Render the footer."""
-        accessor = self.accessor if self.accessor else A(bound_column.name)
-        total = [accessor.resolve(x) for x in table.data]
-        total = sum([x for x in total if x is not None])
+        total = self.get_total(table, bound_column)
         return format_html(_('<div align="right">Total: {}</div>'), EuroColumn.render(self, total))
 
 
 class TimesheetContractOverviewTable(BaseTable):
-    """Timesheet contract overview table."""
+    """
+    Timesheet contract overview table.
+
+    Rows hold a `timesheet` and a `contract`; timesheets should be fetched using `select_related('user')`
+    so rendering doesn't query the user of every row.
+    """
 
     class Meta(BaseTable.Meta):
         pass
 
     user = tables.LinkColumn(
         viewname='admin:auth_user_change',
-        args=[A('timesheet.user.id')],
+        args=[A('timesheet.user_id')],
         accessor='timesheet.user',
         order_by=['timesheet.user.first_name', 'timesheet.user.last_name', 'timesheet.user.username']
     )
@@ -289,78 +407,100 @@ class TimesheetContractOverviewTable(BaseTable):
     standby_days = tables.Column()
 
     def render_actions_footer(table, column, bound_column):
-        buttons = []
-
-        if table.data:
-            # Determine filters for given data
-            query = []
-            years = []
-            months = []
-            users = []
-            contracts = []
-            for record in table.data:
-                if record['timesheet'].year not in years:
-                    years.append(record['timesheet'].year)
-                if record['timesheet'].month not in months:
-                    months.append(record['timesheet'].month)
-                if record['timesheet'].user.id not in users:
-                    users.append(record['timesheet'].user.id)
-                if record['contract'].id not in contracts:
-                    contracts.append(record['contract'].id)
-            if years:
-                query.append('timesheet__year__in=%s' % (','.join(map(str, years))))
-            if months:
-                query.append('timesheet__month__in=%s' % (','.join(map(str, months))))
-            if users:
-                query.append('timesheet__user__id__in=%s' % (','.join(map(str, users))))
-            if contracts:
-                query.append('contract__id__in=%s' % (','.join(map(str, contracts))))
-
-            buttons.append(('<a class="button" href="%(url)s?%(query)s">Details</a>') % {
-                'url': reverse('admin:ninetofiver_performance_changelist'),
-                'query': '&'.join(query),
-            })
-
-            pks = ','.join(['%s:%s:%s' % (x['timesheet'].user.id, x['timesheet'].id, x['contract'].id)
-                            for x in table.data])
-            buttons.append('<a class="button" href="%s">PDF</a>' % reverse('admin_timesheet_contract_pdf_export',
-                           kwargs={'user_timesheet_contract_pks': pks}))
-
-        return format_html('%s' % ('&nbsp;'.join(buttons)))
+        if not table.materialized_data:
+            return ''
+
+        # Determine filters for given data
+        query = []
+        years = set()
+        months = set()
+        users = set()
+        contracts = set()
+        for record in table.materialized_data:
+            timesheet = record['timesheet']
+            years.add(timesheet.year)
+            months.add(timesheet.month)
+            users.add(timesheet.user_id)
+            contracts.add(record['contract'].id)
+        query.append(('timesheet__year__in', ','.join(map(str, sorted(years)))))
+        query.append(('timesheet__month__in', ','.join(map(str, sorted(months)))))
+        query.append(('timesheet__user__id__in', ','.join(map(str, sorted(users)))))
+        query.append(('contract__id__in', ','.join(map(str, sorted(contracts)))))
+
+        pks = ','.join(['%s:%s:%s' % (x['timesheet'].user_id, x['timesheet'].id, x['contract'].id)
+                        for x in table.materialized_data])
+
+        return _buttons(
+            format_html('<a class="button" href="{}?{}">Details</a>',
+                        _reverse('admin:ninetofiver_performance_changelist'), urlencode(query, safe=',')),
+            format_html('<a class="button" href="{}">PDF</a>',
+                        reverse('admin_timesheet_contract_pdf_export', kwargs={'user_timesheet_contract_pks': pks})),
+        )
 
     actions = tables.Column(accessor='timesheet', orderable=False, exclude_from_export=True,
                             footer=render_actions_footer)
 
     def render_actions(self, record):
-        buttons = []
-        buttons.append(('<a class="button" href="%(url)s?' +
-                        'contract__id__exact=%(contract)s&' +
-                        'timesheet__user__id__exact=%(user)s&' +
-                        'timesheet__year=%(year)s&' +
-                        'timesheet__month=%(month)s">Details</a>') % {
-            'url': reverse('admin:ninetofiver_performance_changelist'),
-            'contract': record['contract'].id,
-            'user': record['timesheet'].user.id,
-            'year': record['timesheet'].year,
-            'month': record['timesheet'].month,
-        })
-        buttons.append('<a class="button" href="%s">PDF</a>' % reverse('admin_timesheet_contract_pdf_export', kwargs={
-            'user_timesheet_contract_pks': '%s:%s:%s' % (record['timesheet'].user.id, record['timesheet'].id,
-                                                         record['contract'].id),
-        }))
+        timesheet = record['timesheet']
+
+        return _buttons(
+            format_html('<a class="button" href="{}?{}">Details</a>',
+                        _reverse('admin:ninetofiver_performance_changelist'),
+                        urlencode([
+                            ('contract__id__exact', record['contract'].id),
+                            ('timesheet__user__id__exact', timesheet.user_id),
+                            ('timesheet__year', timesheet.year),
+                            ('timesheet__month', timesheet.month),
+                        ])),
+            format_html('<a class="button" href="{}">PDF</a>',
+                        reverse('admin_timesheet_contract_pdf_export', kwargs={
+                            'user_timesheet_contract_pks': '%s:%s:%s' % (timesheet.user_id, timesheet.id,
+                                                                         record['contract'].id),
+                        })),
+        )
+
+
+# Styles of the "% filled in" cells, for percentages below each threshold and above the last one
+PERCENTAGE_COMPLETE_THRESHOLDS = (25, 50, 75, 90)
+PERCENTAGE_COMPLETE_STYLES = tuple('background-color: rgb(%s);' % color for color in (
+    '244,85,85', '244,154,85', '244,231,85', '165,244,85', '67,232,55'))
+
+
+def _get_percentage_complete(range_info):
+    """Get the percentage of work hours filled in for the given range info, or None if there are none."""
+    if not range_info:
+        return None
+    work_hours = range_info.get('work_hours')
+    remaining_hours = range_info.get('remaining_hours')
+    if not work_hours or remaining_hours is None:
+        return None
+    return floor((100 - (remaining_hours / work_hours * 100)) * 10) / 10
+
 
-        return format_html('%s' % ('&nbsp;'.join(buttons)))
+def _percentage_complete_style(column_name):
+    """Get a td style callable coloring cells by the percentage complete stored under the given column name."""
+    def style(record):
+        perc = record.get(column_name)
+        if perc is not None:
+            return PERCENTAGE_COMPLETE_STYLES[bisect_right(PERCENTAGE_COMPLETE_THRESHOLDS, perc)]
+
+    return style
 
 
 class TimesheetOverviewTable(BaseTable):
-    """Timesheet overview table."""
+    """
+    Timesheet overview table.
+
+    Rows hold a `timesheet`, which should be fetched using `select_related('user')` so rendering doesn't
+    query the user of every row.
+    """
 
     class Meta(BaseTable.Meta):
         pass
 
     user = tables.LinkColumn(
         viewname='admin:auth_user_change',
-        args=[A('timesheet.user.id')],
+        args=[A('timesheet.user_id')],
         accessor='timesheet.user',
         order_by=['timesheet.user.first_name', 'timesheet.user.last_name', 'timesheet.user.username']
     )
@@ -376,37 +516,43 @@ class TimesheetOverviewTable(BaseTable):
     holiday_hours = SummedHoursColumn(accessor='range_info.holiday_hours')
     remaining_hours = SummedHoursColumn(accessor='range_info.remaining_hours')
     attachments = tables.Column(accessor='timesheet.attachments', orderable=False)
-    percentage_complete_currmonth = tables.Column(accessor="range_info",orderable=False, verbose_name="% filled in (until today)")
-    percentage_complete = tables.Column(accessor="range_info",orderable=False, verbose_name="% filled in (whole month)")
+    percentage_complete_currmonth = tables.Column(empty_values=(), orderable=False, exclude_from_export=True,
+                                                  verbose_name="% filled in (until today)",
+                                                  attrs={'td': {'style': _percentage_complete_style(
+                                                      'percentage_complete_currmonth')}})
+    percentage_complete = tables.Column(empty_values=(), orderable=False,
+                                        verbose_name="% filled in (whole month)",
+                                        attrs={'td': {'style': _percentage_complete_style('percentage_complete')}})
     actions = tables.Column(accessor='timesheet', orderable=False, exclude_from_export=True)
     
-    def before_render(self,request):
-        if int(self.request.GET.get("month")) != date.today().month or int(self.request.GET.get("year")) != date.today().year:
-            self.columns.hide("percentage_complete_currmonth")
-        
-    def render_percentage_complete_currmonth(self,record,value,column):
-        # today = date.today()
-        # next_month = date.today().replace(day=28) + timedelta(days=4)
-        # last = next_month - timedelta(days=next_month.day)
-        # contract = models.EmploymentContract.objects.get(started_at__lte=f"{today.year}-{f'0{today.month}' if today.month < 10 else today.month}-01",ended_at__gte=f"{today.year}-{f'0{today.month}' if today.month < 10 else today.month}-{last.day}",user=record["timesheet"].user.id)
+    def before_render(self, request):
+        today = date.today()
         try:
-            perc = floor((100 - (record["range_info_to_day"]["remaining_hours"] / record["range_info_to_day"]["work_hours"] * 100))*10)/10
-        except:
-            perc = -1
-        c = "244,85,85" if perc < 25 else "244,154,85" if perc < 50 else "244,231,85" if perc<75 else "165,244,85" if perc<90 else "67,232,55"
-        if perc != -1:
-            column.attrs = {'td':{'style':f"background-color: rgb({c});"}}
-        return format_html(f'<p>{perc} %</p>' if perc != -1 else "<p></p>")
-    
-    def render_percentage_complete(self, record,value,column):
-        try:
-            perc = floor((100 - (record["range_info"]["remaining_hours"] / record["range_info"]["work_hours"] * 100))*10)/10
-        except:
-            perc = -1
-        c = "244,85,85" if perc < 25 else "244,154,85" if perc < 50 else "244,231,85" if perc<75 else "165,244,85" if perc<90 else "67,232,55"
-        if perc != -1:
-            column.attrs = {'td':{'style':f"background-color: rgb({c});"}}
-        return format_html(f'<p>{perc} %</p>' if perc != -1 else "<p></p>")
+            month, year = int(request.GET['month']), int(request.GET['year'])
+        except (KeyError, ValueError):
+            return
+        if (month, year) != (today.month, today.year):
+            self.columns.hide('percentage_complete_currmonth')
+
+    def __init__(self, data, *args, **kwargs):
+        # Compute the percentages in a single pass up front, so cell styling and rendering don't both redo it,
+        # storing them on copies of the records to leave the caller's data untouched
+        data = [dict(record,
+                     percentage_complete=_get_percentage_complete(record.get('range_info')),
+                     percentage_complete_currmonth=_get_percentage_complete(record.get('range_info_to_day')))
+                for record in data]
+        super().__init__(data, *args, **kwargs)
+
+    def render_percentage_complete_currmonth(self, value):
+        return self._render_percentage_complete(value)
+
+    def render_percentage_complete(self, value):
+        return self._render_percentage_complete(value)
+
+    def _render_percentage_complete(self, perc):
+        if perc is None:
+            return format_html('<p></p>')
+        return format_html('<p>{} %</p>', perc)
 
     def render_attachments(self, record):
         return format_html('<br>'.join('<a href="%s">%s</a>'
@@ -417,29 +563,28 @@ class TimesheetOverviewTable(BaseTable):
                            % (x.get_file_url(), str(x)) for x in list(record['timesheet'].attachments.all())))
 
     def render_actions(self, record):
-        buttons = []
-
-        if record['timesheet'].status == models.STATUS_PENDING:
-            buttons.append('<a class="button" href="%(url)s?return=true">Close</a>' % {
-                'url': reverse('admin_timesheet_close', kwargs={'timesheet_pk': record['timesheet'].id}),
-            })
-            buttons.append('<a class="button" href="%(url)s?return=true">Reopen</a>' % {
-                'url': reverse('admin_timesheet_activate', kwargs={'timesheet_pk': record['timesheet'].id}),
-            })
-
-        from_date, until_date = record['timesheet'].get_date_range()
-
-        buttons.append(('<a class="button" href="%(url)s?' +
-                        'user=%(user)s&' +
-                        'from_date=%(from_date)s&' +
-                        'until_date=%(until_date)s">Details</a>') % {
-            'url': reverse('admin_report_user_range_info'),
-            'user': record['timesheet'].user.id,
-            'from_date': from_date.strftime('%Y-%m-%d'),
-            'until_date': until_date.strftime('%Y-%m-%d'),
-        })
-
-        return format_html('%s' % ('&nbsp;'.join(buttons)))
+        timesheet = record['timesheet']
+        close_button = reopen_button = None
+
+        if timesheet.status == models.STATUS_PENDING:
+            close_button = format_html('<a class="button" href="{}?return=true">Close</a>',
+                                       reverse('admin_timesheet_close', kwargs={'timesheet_pk': timesheet.id}))
+            reopen_button = format_html('<a class="button" href="{}?return=true">Reopen</a>',
+                                        reverse('admin_timesheet_activate', kwargs={'timesheet_pk': timesheet.id}))
+
+        from_date, until_date = timesheet.get_date_range()
+
+        return _buttons(
+            close_button,
+            reopen_button,
+            format_html('<a class="button" href="{}?{}">Details</a>',
+                        _reverse('admin_report_user_range_info'),
+                        urlencode([
+                            ('user', timesheet.user_id),
+                            ('from_date', from_date.isoformat()),
+                            ('until_date', until_date.isoformat()),
+                        ])),
+        )
 
 
 class UserRangeInfoTable(BaseTable):
@@ -457,72 +602,65 @@ class UserRangeInfoTable(BaseTable):
     overtime_hours = SummedHoursColumn(accessor='day_detail.overtime_hours')
 
     def render_actions(self, record):
-        buttons = []
+        day = record['date']
+        date_str = day.isoformat()
+        performance_button = holidays_button = leave_button = None
 
         if record['day_detail']['performed_hours']:
-            buttons.append(('<a class="button" href="%(url)s?' +
-                            'timesheet__user__id__exact=%(user)s&' +
-                            'timesheet__year=%(year)s&' +
-                            'timesheet__month=%(month)s&' +
-                            'date__range__lte=%(date)s&' +
-                            'date__range__gte=%(date)s">Performance</a>') % {
-                'url': reverse('admin:ninetofiver_performance_changelist'),
-                'user': record['user'].id,
-                'year': record['date'].year,
-                'month': record['date'].month,
-                'date': record['date'].strftime('%Y-%m-%d'),
-            })
+            performance_button = format_html('<a class="button" href="{}?{}">Performance</a>',
+                                             _reverse('admin:ninetofiver_performance_changelist'),
+                                             urlencode([
+                                                 ('timesheet__user__id__exact', record['user'].id),
+                                                 ('timesheet__year', day.year),
+                                                 ('timesheet__month', day.month),
+                                                 ('date__range__lte', date_str),
+                                                 ('date__range__gte', date_str),
+                                             ]))
 
         if record['day_detail']['holiday_hours']:
-            buttons.append(('<a class="button" href="%(url)s?' +
-                            'date__range__gte=%(date)s&' +
-                            'date__range__lte=%(date)s">Holidays</a>') % {
-                'url': reverse('admin:ninetofiver_holiday_changelist'),
-                'date': record['date'].strftime('%Y-%m-%d'),
-            })
+            holidays_button = format_html('<a class="button" href="{}?{}">Holidays</a>',
+                                          _reverse('admin:ninetofiver_holiday_changelist'),
+                                          urlencode([
+                                              ('date__range__gte', date_str),
+                                              ('date__range__lte', date_str),
+                                          ]))
 
         if record['day_detail']['leave_hours']:
-            buttons.append(('<a class="button" href="%(url)s?' +
-                            'user__id__exact=%(user)s&' +
-                            'status__exact=%(status)s&' +
-                            'leavedate__starts_at__range__gte_0=%(leavedate__starts_at__range__gte_0)s&' +
-                            'leavedate__starts_at__range__gte_1=%(leavedate__starts_at__range__gte_1)s&' +
-                            'leavedate__starts_at__range__lte_0=%(leavedate__starts_at__range__lte_0)s&' +
-                            'leavedate__starts_at__range__lte_1=%(leavedate__starts_at__range__lte_1)s">Leave</a>') % {
-                'url': reverse('admin:ninetofiver_leave_changelist'),
-                'user': record['user'].id,
-                'status': models.STATUS_APPROVED,
-                'leavedate__starts_at__range__gte_0': record['date'].strftime('%Y-%m-%d'),
-                'leavedate__starts_at__range__gte_1': '00:00:00',
-                'leavedate__starts_at__range__lte_0': record['date'].strftime('%Y-%m-%d'),
-                'leavedate__starts_at__range__lte_1': '23:59:59',
-            })
-
-        return format_html('%s' % ('&nbsp;'.join(buttons)))
+            leave_button = format_html('<a class="button" href="{}?{}">Leave</a>',
+                                       _reverse('admin:ninetofiver_leave_changelist'),
+                                       urlencode([
+                                           ('user__id__exact', record['user'].id),
+                                           ('status__exact', models.STATUS_APPROVED),
+                                           ('leavedate__starts_at__range__gte_0', date_str),
+                                           ('leavedate__starts_at__range__gte_1', '00:00:00'),
+                                           ('leavedate__starts_at__range__lte_0', date_str),
+                                           ('leavedate__starts_at__range__lte_1', '23:59:59'),
+                                       ]))
+
+        return _buttons(performance_button, holidays_button, leave_button)
 
     def render_actions_footer(table, column, bound_column):
-
-        users = []
-        dates = []
-        for record in table.data:
-            if record['date'] not in dates:
-                dates.append(record['date'])
-            if record['user'].id not in users:
-                users.append(record['user'].id)
-
-        return format_html(('<a class="button" href="%(url)s?' +
-                            'timesheet__user__id__exact=%(user)s&' +
-                            'timesheet__year=%(year)s&' +
-                            'timesheet__month=%(month)s&' +
-                            'date__range__lte=%(end_date)s&' +
-                            'date__range__gte=%(start_date)s">All performances</a>') % {
-            'url': reverse('admin:ninetofiver_performance_changelist'),
-            'user': users[0],
-            'year': dates[0].year,
-            'month': dates[0].month,
-            'start_date': min(dates).strftime('%Y-%m-%d'),
-            'end_date': max(dates).strftime('%Y-%m-%d'),
-        })
+        if not table.materialized_data:
+            return ''
+
+        first_record = table.materialized_data[0]
+        start_date = end_date = first_record['date']
+        for record in table.materialized_data:
+            day = record['date']
+            if day < start_date:
+                start_date = day
+            elif day > end_date:
+                end_date = day
+
+        return format_html('<a class="button" href="{}?{}">All performances</a>',
+                           _reverse('admin:ninetofiver_performance_changelist'),
+                           urlencode([
+                               ('timesheet__user__id__exact', first_record['user'].id),
+                               ('timesheet__year', first_record['date'].year),
+                               ('timesheet__month', first_record['date'].month),
+                               ('date__range__lte', end_date.isoformat()),
+                               ('date__range__gte', start_date.isoformat()),
+                           ]))
 
     actions = tables.Column(accessor='date', orderable=False, exclude_from_export=True,
                             footer=render_actions_footer)
@@ -541,25 +679,23 @@ class UserGroupLeaveOverviewTable(BaseTable):
         """Constructor."""
         # Create an additional column for every leave type
         extra_columns = []
-        for leave_type in models.LeaveType.objects.order_by('name'):
-            column = SummedHoursColumn(accessor=A('leave_type_hours.%s' % leave_type.name))
-            extra_columns.append([leave_type.name, column])
+        for leave_type_name in get_leave_type_names():
+            column = SummedHoursColumn(accessor=A('leave_type_hours.%s' % leave_type_name))
+            extra_columns.append([leave_type_name, column])
         kwargs['extra_columns'] = extra_columns
         kwargs['sequence'] = ('user', '...', 'actions')
         super().__init__(*args, **kwargs)
 
     def render_actions(self, record):
-        buttons = []
-
-        buttons.append(('<a class="button" href="%(url)s?' +
-                        'user=%(user)s&from_date=%(from_date)s&until_date=%(until_date)s">Leave</a>') % {
-            'url': reverse('admin_report_user_leave_overview'),
-            'user': record['user'].id,
-            'from_date':record["from_date"].strftime('%Y-%m-%d'),
-            'until_date':record['until_date'].strftime('%Y-%m-%d')
-        })
-
-        return format_html('%s' % ('&nbsp;'.join(buttons)))
+        return _buttons(
+            format_html('<a class="button" href="{}?{}">Leave</a>',
+                        _reverse('admin_report_user_leave_overview'),
+                        urlencode([
+                            ('user', record['user'].id),
+                            ('from_date', record['from_date'].isoformat()),
+                            ('until_date', record['until_date'].isoformat()),
+                        ])),
+        )
 
 
 class UserLeaveOverviewTable(BaseTable):
@@ -577,35 +713,43 @@ class UserLeaveOverviewTable(BaseTable):
         """Constructor."""
         # Create an additional column for every leave type
         extra_columns = []
-        for leave_type in models.LeaveType.objects.order_by('name'):
-            column = SummedHoursColumn(accessor=A('leave_type_hours.%s' % leave_type.name))
-            extra_columns.append([leave_type.name, column])
+        for leave_type_name in get_leave_type_names():
+            column = SummedHoursColumn(accessor=A('leave_type_hours.%s' % leave_type_name))
+            extra_columns.append([leave_type_name, column])
         kwargs['extra_columns'] = extra_columns
         kwargs['sequence'] = ('year', 'month', '...', 'actions')
         super().__init__(*args, **kwargs)
 
     def render_actions(self, record):
-        buttons = []
-
         date_range = month_date_range(record['year'], record['month'])
 
-        buttons.append(('<a class="button" href="%(url)s?' +
-                        'user__id__exact=%(user)s&' +
-                        'status__exact=%(status)s&' +
-                        'leavedate__starts_at__gte_0=%(leavedate__starts_at__gte_0)s&' +
-                        'leavedate__starts_at__gte_1=%(leavedate__starts_at__gte_1)s&' +
-                        'leavedate__starts_at__lte_0=%(leavedate__starts_at__lte_0)s&' +
-                        'leavedate__starts_at__lte_1=%(leavedate__starts_at__lte_1)s">Leave</a>') % {
-            'url': reverse('admin:ninetofiver_leave_changelist'),
-            'user': record['user'].id,
-            'status': models.STATUS_APPROVED,
-            'leavedate__starts_at__gte_0': date_range[0].strftime('%Y-%m-%d'),
-            'leavedate__starts_at__gte_1': '00:00:00',
-            'leavedate__starts_at__lte_0': date_range[1].strftime('%Y-%m-%d'),
-            'leavedate__starts_at__lte_1': '23:59:59',
-        })
+        return _buttons(
+            format_html('<a class="button" href="{}?{}">Leave</a>',
+                        _reverse('admin:ninetofiver_leave_changelist'),
+                        urlencode([
+                            ('user__id__exact', record['user'].id),
+                            ('status__exact', models.STATUS_APPROVED),
+                            ('leavedate__starts_at__gte_0', date_range[0].isoformat()),
+                            ('leavedate__starts_at__gte_1', '00:00:00'),
+                            ('leavedate__starts_at__lte_0', date_range[1].isoformat()),
+                            ('leavedate__starts_at__lte_1', '23:59:59'),
+                        ])),
+        )
+
 
-        return format_html('%s' % ('&nbsp;'.join(buttons)))
+def _render_work_ratio(record):
+    """Render a progress bar showing the ratio of customer hours, internal hours and leaves of a record."""
+    total_hours = record['customer_hours'] + record['internal_hours'] + record['leaves'] or 1.0
+    bars = (
+        ('success', round((record['customer_hours'] / total_hours) * 100, 2)),
+        ('warning', round((record['internal_hours'] / total_hours) * 100, 2)),
+        ('secondary', round((record['leaves'] / total_hours) * 100, 2)),
+    )
+    return format_html(
+        '<div class="progress" style="min-width: 300px;">{}</div>',
+        format_html_join('', '<div class="progress-bar bg-{}" role="progressbar" style="width: {}%">{}%</div>',
+                         ((bg, pct, pct) for bg, pct in bars)),
+    )
 
 
 class UserWorkRatioByUserTable(BaseTable):
@@ -623,19 +767,7 @@ class UserWorkRatioByUserTable(BaseTable):
     ratio = tables.Column(empty_values=())
 
     def render_ratio(self, record):
-        total_hours = record['customer_hours'] + record['internal_hours'] + record['leaves']
-        customer_hours_pct = round((record['customer_hours'] / (total_hours if total_hours else 1.0)) * 100, 2)
-        internal_hours_pct = round((record['internal_hours'] / (total_hours if total_hours else 1.0)) * 100, 2)
-        leaves_pct = round((record['leaves'] / (total_hours if total_hours else 1.0)) * 100, 2)
-        res = '<div class="progress" style="min-width: 300px;">'
-        res += '<div class="progress-bar bg-success" role="progressbar" style="width: {}%">{}%</div>'.format(
-            customer_hours_pct, customer_hours_pct)
-        res += '<div class="progress-bar bg-warning" role="progressbar" style="width: {}%">{}%</div>'.format(
-            internal_hours_pct, internal_hours_pct)
-        res += '<div class="progress-bar bg-secondary" role="progressbar" style="width: {}%">{}%</div>'.format(
-            leaves_pct, leaves_pct)
-        res += '</div>'
-        return format_html(res)
+        return _render_work_ratio(record)
 
 
 class UserWorkRatioByMonthTable(BaseTable):
@@ -657,19 +789,18 @@ class UserWorkRatioByMonthTable(BaseTable):
     ratio = tables.Column(empty_values=())
 
     def render_ratio(self, record):
-        total_hours = record['customer_hours'] + record['internal_hours'] + record['leaves']
-        customer_hours_pct = round((record['customer_hours'] / (total_hours if total_hours else 1.0)) * 100, 2)
-        internal_hours_pct = round((record['internal_hours'] / (total_hours if total_hours else 1.0)) * 100, 2)
-        leaves_pct = round((record['leaves'] / (total_hours if total_hours else 1.0)) * 100, 2)
-        res = '<div class="progress" style="min-width: 300px;">'
-        res += '<div class="progress-bar bg-success" role="progressbar" style="width: {}%">{}%</div>'.format(
-            customer_hours_pct, customer_hours_pct)
-        res += '<div class="progress-bar bg-warning" role="progressbar" style="width: {}%">{}%</div>'.format(
-            internal_hours_pct, internal_hours_pct)
-        res += '<div class="progress-bar bg-secondary" role="progressbar" style="width: {}%">{}%</div>'.format(
-            leaves_pct, leaves_pct)
-        res += '</div>'
-        return format_html(res)
+        return _render_work_ratio(record)
+
+
+WORK_RATIO_OVERVIEW_HTML = (
+    '<div class="progress" style="min-width: 300px;">'
+    '<div class="progress-bar bg-success" role="progressbar" '
+    'style="width: {consultancy_pct}%">{consultancy_pct}%</div>'
+    '<div class="progress-bar bg-info" role="progressbar" style="width: {project_pct}%">{project_pct}%</div>'
+    '<div class="progress-bar bg-warning" role="progressbar" style="width: {support_pct}%">{support_pct}%</div>'
+    '<div class="progress-bar bg-secondary" role="progressbar" style="width: {leave_pct}%">{leave_pct}%</div>'
+    '</div>'
+)
 
 
 class UserWorkRatioOverviewTable(BaseTable):
@@ -693,52 +824,72 @@ class UserWorkRatioOverviewTable(BaseTable):
     actions = tables.Column(accessor='user', orderable=False, exclude_from_export=True)
 
     def render_ratio(self, record):
-        res = ('<div class="progress" style="min-width: 300px;">' +
-               '<div class="progress-bar bg-success" role="progressbar" style="width: %(consultancy_pct)s%%">%(consultancy_pct)s%%</div>' +
-               '<div class="progress-bar bg-info" role="progressbar" style="width: %(project_pct)s%%">%(project_pct)s%%</div>' +
-               '<div class="progress-bar bg-warning" role="progressbar" style="width: %(support_pct)s%%">%(support_pct)s%%</div>' +
-               '<div class="progress-bar bg-secondary" role="progressbar" style="width: %(leave_pct)s%%">%(leave_pct)s%%</div>' +
-               '</div>') % record
-
-        return format_html(res)
+        return format_html(WORK_RATIO_OVERVIEW_HTML, consultancy_pct=record['consultancy_pct'],
+                           project_pct=record['project_pct'], support_pct=record['support_pct'],
+                           leave_pct=record['leave_pct'])
 
     def render_actions(self, record):
-        buttons = []
-
-        date_range = month_date_range(record['year'], record['month'])
+        performance_button = leave_button = None
 
         if record['consultancy_hours'] or record['project_hours'] or record['support_hours']:
-            buttons.append(('<a class="button" href="%(url)s?' +
-                            'timesheet__user__id__exact=%(user)s&' +
-                            'timesheet__year=%(year)s&' +
-                            'timesheet__month=%(month)s">Performance</a>') % {
-                'url': reverse('admin:ninetofiver_performance_changelist'),
-                'user': record['user'].id,
-                'year': record['year'],
-                'month': record['month'],
-            })
+            performance_button = format_html('<a class="button" href="{}?{}">Performance</a>',
+                                             _reverse('admin:ninetofiver_performance_changelist'),
+                                             urlencode([
+                                                 ('timesheet__user__id__exact', record['user'].id),
+                                                 ('timesheet__year', record['year']),
+                                                 ('timesheet__month', record['month']),
+                                             ]))
 
         if record['leave_hours']:
-            buttons.append(('<a class="button" href="%(url)s?' +
-                            'user__id__exact=%(user)s&' +
-                            'status__exact=%(status)s&' +
-                            'leavedate__starts_at__range__gte_0=%(leavedate__starts_at__range__gte_0)s&' +
-                            'leavedate__starts_at__range__gte_1=%(leavedate__starts_at__range__gte_1)s&' +
-                            'leavedate__starts_at__range__lte_0=%(leavedate__starts_at__range__lte_0)s&' +
-                            'leavedate__starts_at__range__lte_1=%(leavedate__starts_at__range__lte_1)s">Leave</a>') % {
-                'url': reverse('admin:ninetofiver_leave_changelist'),
-                'user': record['user'].id,
-                'status': models.STATUS_APPROVED,
-                'leavedate__starts_at__range__gte_0': date_range[0].strftime('%Y-%m-%d'),
-                'leavedate__starts_at__range__gte_1': '00:00:00',
-                'leavedate__starts_at__range__lte_0': date_range[1].strftime('%Y-%m-%d'),
-                'leavedate__starts_at__range__lte_1': '23:59:59',
-            })
-
-        return format_html('%s' % ('&nbsp;'.join(buttons)))
-
-
-class ResourceAvailabilityDayColumn(tables.TemplateColumn):
+            date_range = month_date_range(record['year'], record['month'])
+            leave_button = format_html('<a class="button" href="{}?{}">Leave</a>',
+                                       _reverse('admin:ninetofiver_leave_changelist'),
+                                       urlencode([
+                                           ('user__id__exact', record['user'].id),
+                                           ('status__exact', models.STATUS_APPROVED),
+                                           ('leavedate__starts_at__range__gte_0', date_range[0].isoformat()),
+                                           ('leavedate__starts_at__range__gte_1', '00:00:00'),
+                                           ('leavedate__starts_at__range__lte_0', date_range[1].isoformat()),
+                                           ('leavedate__starts_at__range__lte_1', '23:59:59'),
+                                       ]))
+
+        return _buttons(performance_button, leave_button)
+
+
+@lru_cache(maxsize=366)
+def _get_day_label(day_date):
+    """Get the column header label of the given day."""
+    return day_date.strftime('%a, %d %b')
+
+
+@lru_cache(maxsize=64)
+def _get_day_columns(from_date, until_date):
+    """Get the label and key in the records' days of the column of every day in the given date range."""
+    return tuple((_get_day_label(day_date), str(day_date)) for day_date in dates_in_range(from_date, until_date))
+
+
+class DayColumnMixin(object):
+    """
+    Mixin for columns showing a single day out of the `days` of a record.
+
+    The day is looked up directly by its key, rather than by resolving a separate `days.<date>` accessor for
+    every cell.
+    """
+
+    def __init__(self, day, *args, **kwargs):
+        """Constructor."""
+        self.day = day
+        kwargs['accessor'] = A('days')
+        super().__init__(*args, **kwargs)
+
+    def render(self, record, table, value, bound_column, **kwargs):
+        value = value.get(self.day)
+        if value is None:
+            return bound_column.default
+        return super().render(record, table, value, bound_column, **kwargs)
+
+
+class ResourceAvailabilityDayColumn(DayColumnMixin, CachedTemplateColumn):
     """Resource availability day column."""
 
     def __init__(self, *args, **kwargs):
@@ -747,7 +898,7 @@ class ResourceAvailabilityDayColumn(tables.TemplateColumn):
         super().__init__(*args, **kwargs)
 
 
-class MonthlyResourceAvailabilityDayColumn(tables.TemplateColumn):
+class MonthlyResourceAvailabilityDayColumn(DayColumnMixin, CachedTemplateColumn):
     """Timesheet monthly overview day column."""
 
     def __init__(self, *args, **kwargs):
@@ -780,16 +931,14 @@ class ResourceAvailabilityOverviewTable(BaseTable):
         # Create an additional column for every leave type
         extra_columns = []
         if from_date and until_date:
-            for day_date in dates_in_range(from_date, until_date):
-                date_str = str(day_date)
-                column = ResourceAvailabilityDayColumn(accessor=A('days.%s' % date_str), orderable=False)
-                extra_columns.append([day_date.strftime('%a, %d %b'), column])
+            for label, day in _get_day_columns(from_date, until_date):
+                extra_columns.append([label, ResourceAvailabilityDayColumn(day, orderable=False)])
         kwargs['extra_columns'] = extra_columns
         kwargs['sequence'] = ('user', '...')
         super().__init__(*args, **kwargs)
 
 
-class InternalAvailabilityDayColumn(tables.TemplateColumn):
+class InternalAvailabilityDayColumn(DayColumnMixin, CachedTemplateColumn):
     """Internal availability day column."""
 
     def __init__(self, *args, **kwargs):
@@ -798,7 +947,7 @@ class InternalAvailabilityDayColumn(tables.TemplateColumn):
         super().__init__(*args, **kwargs)
 
 
-class InternalAvailabilityIssuesColumn(tables.TemplateColumn):
+class InternalAvailabilityIssuesColumn(CachedTemplateColumn):
     """Internal availability issues column."""
 
     def __init__(self, *args, **kwargs):
@@ -822,18 +971,23 @@ class InternalAvailabilityOverviewTable(BaseTable):
         order_by=['user.first_name', 'user.last_name', 'user.username']
     )
 
-    def __init__(self, from_date, until_date, *args, **kwargs):
-        """Constructor."""
+    def __init__(self, from_date, until_date, *args, has_issues=None, **kwargs):
+        """
+        Constructor.
+
+        Callers which know whether any of the records hold issues can pass `has_issues`, so the records
+        don't have to be scanned for them.
+        """
         # Create an additional column for every availability type
         extra_columns = []
         if from_date and until_date:
-            for day_date in dates_in_range(from_date, until_date):
-                date_str = str(day_date)
-                column = InternalAvailabilityDayColumn(accessor=A('days.%s' % date_str), orderable=False)
-                extra_columns.append([day_date.strftime('%a, %d %b'), column])
+            for label, day in _get_day_columns(from_date, until_date):
+                extra_columns.append([label, InternalAvailabilityDayColumn(day, orderable=False)])
 
         # Add issues if present
-        if any('issues' in x for x in args[0]):
+        if has_issues is None:
+            has_issues = any('issues' in x for x in args[0])
+        if has_issues:
             column = InternalAvailabilityIssuesColumn(accessor=('issues'))
             extra_columns.append(['Issues', column])
 
@@ -860,15 +1014,52 @@ class TimesheetMonthlyOverviewTable(BaseTable):
         # Create an additional column for every leave type
         extra_columns = []
         if from_date and until_date:
-            for day_date in dates_in_range(from_date, until_date):
-                date_str = str(day_date)
-                column = MonthlyResourceAvailabilityDayColumn(accessor=A('days.%s' % date_str), orderable=False)
-                extra_columns.append([day_date.strftime('%a, %d %b'), column])
+            for label, day in _get_day_columns(from_date, until_date):
+                extra_columns.append([label, MonthlyResourceAvailabilityDayColumn(day, orderable=False)])
         kwargs['extra_columns'] = extra_columns
         kwargs['sequence'] = ('user', '...')
         super().__init__(*args, **kwargs)
 
 
+# Buttons shared by the contract overview tables
+CONTRACT_PERFORMANCES_BUTTON = '<a class="button" href="{}?performance__contract={}">Performances</a>'
+CONTRACT_INVOICES_BUTTONS = (
+    '<a class="button" style="border-top-right-radius: 0px; border-bottom-right-radius: 0px; padding-right: 0px;" '
+    'href="{}?contract__id__exact={}">Invoices</a>'
+    '<a class="button" style="border-top-left-radius: 0px; border-bottom-left-radius: 0px;" href="{}?{}">+</a>'
+)
+
+
+def _render_contract_invoices_buttons(contract, **invoice_defaults):
+    """Render the buttons listing the invoices of a contract and adding a new one with the given defaults."""
+    return format_html(CONTRACT_INVOICES_BUTTONS, _reverse('admin:ninetofiver_invoice_changelist'), contract.id,
+                       _reverse('admin:ninetofiver_invoice_add'),
+                       urlencode([('contract', contract.id)] + list(invoice_defaults.items())))
+
+
+# Template listing the users of a contract, shared by the consultancy contract overview tables
+MULTIUSER_TEMPLATE = """
+<ul style="margin:0;padding-inline-start:10px">
+{% for user in value %}
+    <li><a href="{% url 'admin:auth_user_change' user.id %}">{{ user }}</a></li>
+{% empty %}
+-
+{% endfor %}
+</ul>
+"""
+
+
+# Row classes of contracts expiring within each number of days, and of contracts expiring later
+CONTRACT_EXPIRY_DAYS = (30, 60, 90)
+CONTRACT_EXPIRY_CLASSES = ('table-danger', 'table-warning', 'table-info', None)
+
+
+@lru_cache(maxsize=1)
+def _get_contract_expiry_thresholds(today):
+    """Get the end dates below which contracts expire within each of the expiry day counts, as seen from today."""
+    return tuple(today + timedelta(days=days) for days in CONTRACT_EXPIRY_DAYS)
+
+
 class ExpiringConsultancyContractOverviewTable(BaseTable):
     """Expiring consultancy contract overview table."""
 
@@ -879,35 +1070,20 @@ class ExpiringConsultancyContractOverviewTable(BaseTable):
             ends_at = record['calculated_enddate']
             if not ends_at:
                 return
-            if ends_at < date.today() + timedelta(days=30):
-                return 'table-danger'  # Expires within 30 days
-            if ends_at < date.today() + timedelta(days=60):
-                return 'table-warning'  # Expires within 60 days
-            if ends_at < date.today() + timedelta(days=90):
-                return 'table-info'  # Expires within 90 days
-            return
+            thresholds = _get_contract_expiry_thresholds(date.today())
+            return CONTRACT_EXPIRY_CLASSES[bisect_right(thresholds, ends_at)]
 
         row_attrs = {
             'class': determine_row_color
         }
 
-    MULTIUSER_TEMPLATE = """
-<ul style="margin:0;padding-inline-start:10px">
-{% for user in value %}
-    <li><a href="{% url 'admin:auth_user_change' user.id %}">{{ user }}</a></li>
-{% empty %}
--
-{% endfor %}
-</ul>
-    """
-
     contract = tables.LinkColumn(
         viewname='admin:ninetofiver_contract_change',
         args=[A('contract.id')],
         accessor='contract',
         order_by=['contract.name']
     )
-    users = tables.TemplateColumn(
+    users = CachedTemplateColumn(
         template_code=MULTIUSER_TEMPLATE,
         accessor='users',
     )
@@ -933,15 +1109,8 @@ class ExpiringConsultancyContractOverviewTable(BaseTable):
             return format_html(record['calculated_enddate'].strftime('%d/%m/%Y'))
 
     def render_actions(self, record):
-        buttons = []
-
-        buttons.append(('<a class="button" href="%(url)s?' +
-                        'performance__contract=%(contract)s">Performances</a>') % {
-            'url': reverse('admin_report_timesheet_contract_overview'),
-            'contract': record['contract'].id,
-        })
-
-        return format_html('%s' % ('&nbsp;'.join(buttons)))
+        return format_html(CONTRACT_PERFORMANCES_BUTTON,
+                           _reverse('admin_report_timesheet_contract_overview'), record['contract'].id)
 
 
 class InvoicedConsultancyContractOverviewTable(BaseTable):
@@ -949,23 +1118,13 @@ class InvoicedConsultancyContractOverviewTable(BaseTable):
     class Meta(BaseTable.Meta):
         pass
 
-    MULTIUSER_TEMPLATE = """
-<ul style="margin:0;padding-inline-start:10px">
-{% for user in value %}
-    <li><a href="{% url 'admin:auth_user_change' user.id %}">{{ user }}</a></li>
-{% empty %}
--
-{% endfor %}
-</ul>
-    """
-
     contract = tables.LinkColumn(
         viewname='admin:ninetofiver_contract_change',
         args=[A('contract.id')],
         accessor='contract',
         order_by=['contract.name']
     )
-    users = tables.TemplateColumn(
+    users = CachedTemplateColumn(
         template_code=MULTIUSER_TEMPLATE,
         accessor='users',
     )
@@ -981,40 +1140,15 @@ class InvoicedConsultancyContractOverviewTable(BaseTable):
     actions = tables.Column(accessor='contract', orderable=False, exclude_from_export=True)
 
     def render_actions(self, record):
-        buttons = []
-
-        buttons.append(('<a class="button" href="%(url)s?' +
-                        'performance__contract=%(contract)s&' +
-                        'sort=-timesheet' +
-                        '">Performances</a>') % {
-            'url': reverse('admin_report_timesheet_contract_overview'),
-            'contract': record['contract'].id,
-        })
-
-        buttons.append('<a class="button" style="border-top-right-radius: 0px; border-bottom-right-radius: 0px; padding-right: 0px;" href="{url}?'
-                       'contract__id__exact={contract_id}'
-                       '">Invoices</a>'.format(
-                           url=reverse('admin:ninetofiver_invoice_changelist'),
-                           contract_id=record['contract'].id)
-                       +
-                       '<a class="button" style="border-top-left-radius: 0px; border-bottom-left-radius: 0px;"href="{url}?'
-                       'contract={contract_id}&'
-                       'period_starts_at={period_starts_at}&'
-                       'period_ends_at={period_ends_at}&'
-                       'date={date}&'
-                       'price={price}&'
-                       'amount={amount}&'
-                       '">{label}</a>'.format(url=reverse('admin:ninetofiver_invoice_add'),
-                                              label="+",
-                                              contract_id=record['contract'].id,
-                                              period_starts_at=record['action'].get('period_starts_at'),
-                                              period_ends_at=record['action'].get('period_ends_at'),
-                                              date=record['action'].get('date'),
-                                              price=record['action'].get('price'),
-                                              amount=record['action'].get('amount'),
-                                              ))
-
-        return format_html('%s' % ('&nbsp;'.join(buttons)))
+        return _buttons(
+            format_html('<a class="button" href="{}?{}">Performances</a>',
+                        _reverse('admin_report_timesheet_contract_overview'),
+                        urlencode([('performance__contract', record['contract'].id), ('sort', '-timesheet')])),
+            _render_contract_invoices_buttons(record['contract'], **{
+                key: record['action'].get(key)
+                for key in ('period_starts_at', 'period_ends_at', 'date', 'price', 'amount')
+            }),
+        )
 
 
 class ProjectContractOverviewTable(BaseTable):
@@ -1038,61 +1172,39 @@ class ProjectContractOverviewTable(BaseTable):
     # actions = tables.Column(accessor='user', orderable=False, exclude_from_export=True)
 
     def render_contract(self, record):
-        buttons = []
-
-        buttons.append(('<a href="%(url)s' +
-                        '%(contract_id)s">%(contract)s</a>') % {
-            'url': reverse('admin:ninetofiver_contract_changelist'),
-            'contract_id': record['contract'].id,
-            'contract': record['contract'],
-        })
-
-        buttons.append(('<a class="button" href="%(url)s?' +
-                        'performance__contract=%(contract)s">Performances</a>') % {
-            'url': reverse('admin_report_timesheet_contract_overview'),
-            'contract': record['contract'].id,
-        })
-
-        buttons.append('<a class="button" style="border-top-right-radius: 0px; border-bottom-right-radius: 0px; padding-right: 0px;" href="{url}?'
-                       'contract__id__exact={contract_id}'
-                       '">Invoices</a>'.format(
-                           url=reverse('admin:ninetofiver_invoice_changelist'),
-                           contract_id=record['contract'].id)
-                       +
-                       '<a class="button" style="border-top-left-radius: 0px; border-bottom-left-radius: 0px;" href="{url}?'
-                       'contract={contract_id}&'
-                       '">{label}</a>'.format(url=reverse('admin:ninetofiver_invoice_add'),
-                                              label="+",
-                                              contract_id=record['contract'].id)
-                       )
-        buttons.append(('<a class="button" target="_blank" href="%(url)s?' +
-                        'contract=%(contract)s">Logs</a>') % {
-            'url': reverse('admin_report_contract_logs_overview_view'),
-            'contract': record['contract'].id,
-        })
+        contract = record['contract']
 
-        attachment_list = ""
-        for attachment in record['attachments']:
-            attachment_list = attachment_list + \
-                '<a class="dropdown-item" href="{url}">{name}</a>'.format(
-                    url=record['attachments'][attachment]['url'], name=attachment)
+        attachment_list = format_html_join('', '<a class="dropdown-item" href="{}">{}</a>',
+                                           ((attachment['url'], name)
+                                            for name, attachment in record['attachments'].items()))
         if attachment_list:
-            buttons.append('<div class="dropdown">'
-                           '<a class="button dropdown-toggle" href="#" type="button" id="dropdownMenuLink" data-toggle="dropdown" aria-haspopup="true" aria-expanded="false">Attachments</a>'
-                           '<div class="dropdown-menu" aria-labelledby="dropdownMenuLink">' +
-                           attachment_list +
-                           '</div></div>')
+            attachments_button = format_html('<div class="dropdown">'
+                                             '<a class="button dropdown-toggle" href="#" type="button" '
+                                             'id="dropdownMenuLink" data-toggle="dropdown" aria-haspopup="true" '
+                                             'aria-expanded="false">Attachments</a>'
+                                             '<div class="dropdown-menu" aria-labelledby="dropdownMenuLink">{}</div>'
+                                             '</div>', attachment_list)
         else:
-            buttons.append('<div class="dropdown">'
-                           '<a disabled class="button dropdown-toggle" type="button" id="dropdownMenuLink" data-toggle="dropdown" aria-disabled="true" aria-haspopup="true" aria-expanded="false">Attachments</a>'
-                           '</div>')
-
-        return format_html('%s' % ('</br></br>'.join(buttons)))
+            attachments_button = ('<div class="dropdown">'
+                                  '<a disabled class="button dropdown-toggle" type="button" id="dropdownMenuLink" '
+                                  'data-toggle="dropdown" aria-disabled="true" aria-haspopup="true" '
+                                  'aria-expanded="false">Attachments</a>'
+                                  '</div>')
+
+        return _buttons(
+            format_html('<a href="{}{}">{}</a>', _reverse('admin:ninetofiver_contract_changelist'), contract.id,
+                        contract),
+            format_html(CONTRACT_PERFORMANCES_BUTTON, _reverse('admin_report_timesheet_contract_overview'),
+                        contract.id),
+            _render_contract_invoices_buttons(contract),
+            format_html('<a class="button" target="_blank" href="{}?contract={}">Logs</a>',
+                        _reverse('admin_report_contract_logs_overview_view'), contract.id),
+            attachments_button,
+            separator='<br><br>',
+        )
 
     def render_actions(self, record):
-        buttons = []
-
-        return format_html('%s' % ('&nbsp;'.join(buttons)))
+        return ''
 
 
 class UserOvertimeOverviewTable(BaseTable):
@@ -1110,21 +1222,15 @@ class UserOvertimeOverviewTable(BaseTable):
     actions = tables.Column(accessor='user', orderable=False, exclude_from_export=True)
 
     def render_actions(self, record):
-        buttons = []
-
         date_range = month_date_range(record['year'], record['month'])
 
-        buttons.append(('<a class="button" href="%(url)s?' +
-                        'user=%(user)s&' +
-                        'from_date=%(from_date)s&' +
-                        'until_date=%(until_date)s">Details</a>') % {
-            'url': reverse('admin_report_user_range_info'),
-            'user': record['user'].id,
-            'from_date': date_range[0].strftime('%Y-%m-%d'),
-            'until_date': date_range[1].strftime('%Y-%m-%d'),
-        })
-
-        return format_html('%s' % ('&nbsp;'.join(buttons)))
+        return format_html('<a class="button" href="{}?{}">Details</a>',
+                           _reverse('admin_report_user_range_info'),
+                           urlencode([
+                               ('user', record['user'].id),
+                               ('from_date', date_range[0].isoformat()),
+                               ('until_date', date_range[1].isoformat()),
+                           ]))
 
 
 class ExpiringSupportContractOverviewTable(BaseTable):
@@ -1148,28 +1254,11 @@ class ExpiringSupportContractOverviewTable(BaseTable):
     actions = tables.Column(accessor='contract', orderable=False, exclude_from_export=True)
 
     def render_actions(self, record):
-        buttons = []
-
-        buttons.append(('<a class="button" href="%(url)s?' +
-                        'performance__contract=%(contract)s">Performances</a>') % {
-            'url': reverse('admin_report_timesheet_contract_overview'),
-            'contract': record['contract'].id,
-        })
-
-        buttons.append('<a class="button" style="border-top-right-radius: 0px; border-bottom-right-radius: 0px; padding-right: 0px;" href="{url}?'
-                       'contract__id__exact={contract_id}'
-                       '">Invoices</a>'.format(
-                           url=reverse('admin:ninetofiver_invoice_changelist'),
-                           contract_id=record['contract'].id)
-                       +
-                       '<a class="button" style="border-top-left-radius: 0px; border-bottom-left-radius: 0px;" href="{url}?'
-                       'contract={contract_id}&'
-                       '">{label}</a>'.format(url=reverse('admin:ninetofiver_invoice_add'),
-                                              label="+",
-                                              contract_id=record['contract'].id)
-                       )
-
-        return format_html('%s' % ('&nbsp;'.join(buttons)))
+        return _buttons(
+            format_html(CONTRACT_PERFORMANCES_BUTTON,
+                        _reverse('admin_report_timesheet_contract_overview'), record['contract'].id),
+            _render_contract_invoices_buttons(record['contract']),
+        )
 
 
 class ProjectContractBudgetOverviewTable(BaseTable):
@@ -1205,28 +1294,19 @@ class ProjectContractBudgetOverviewTable(BaseTable):
     # actions = tables.Column(accessor='contract', orderable=False, exclude_from_export=True)
 
     def render_contract(self, record):
-        buttons = []
-
-        buttons.append(
-            ('<a href="%(url)s' + '%(contract_id)s">%(contract)s</a><br><br>')
-            % {
-                "url": reverse("admin:ninetofiver_contract_changelist"),
-                "contract_id": record["contract"].id,
-                "contract": record["contract"],
-            }
+        return _buttons(
+            format_html(
+                '<a href="{}{}">{}</a><br><br>',
+                _reverse("admin:ninetofiver_contract_changelist"),
+                record["contract"].id,
+                record["contract"],
+            ),
+            format_html(
+                '<a class="button" href="{}?contract_ptr={}">Details</a>',
+                _reverse("admin_report_project_contract_overview"),
+                record["contract"].id,
+            ),
         )
-        buttons.append(
-            (
-                '<a class="button" href="%(url)s?'
-                + 'contract_ptr=%(contract)s">Details</a>'
-            )
-            % {
-                "url": reverse("admin_report_project_contract_overview"),
-                "contract": record["contract"].id,
-            }
-        )
-
-        return format_html("%s" % ("&nbsp;".join(buttons)))
 
 
 class ExpiringUserTrainingOverviewTable(BaseTable):
@@ -1259,14 +1339,9 @@ class ExpiringUserTrainingOverviewTable(BaseTable):
     actions = tables.Column(accessor='training', orderable=False, exclude_from_export=True)
 
     def render_actions(self, record):
-        buttons = []
-
-        buttons.append('<a class="button" href="{url}?">{label}</a>'.format(
-            url=reverse('admin:ninetofiver_usertraining_change', args=(record['training'].user_training.id,)),
-            label="Details"
-        ))
-
-        return format_html('%s' % ('&nbsp;'.join(buttons)))
+        return format_html('<a class="button" href="{}?">Details</a>',
+                           reverse('admin:ninetofiver_usertraining_change',
+                                   args=(record['training'].user_training.id,)))
 
 class ContractLogOverviewTable(BaseTable):
     """Timesheet contract overview table."""
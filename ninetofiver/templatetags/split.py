@@ -1,11 +1,11 @@
 from django import template
+from django.template.defaultfilters import stringfilter
 
 register = template.Library()
 
+
 @register.filter
-def split(value,arg:str):
+@stringfilter
+def split(value, arg):
     """Splits a string using the given argument"""
-    if not value or not arg:
-        return value
-
-    return value.split(arg)
\ No newline at end of file
+    return value.split(arg)
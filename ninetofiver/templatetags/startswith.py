@@ -1,11 +1,11 @@
 from django import template
+from django.template.defaultfilters import stringfilter
 
 register = template.Library()
 
+
 @register.filter
-def startswith(value,arg:str):
+@stringfilter
+def startswith(value, arg):
     """Checks if value starts with arg"""
-    if not value or not arg:
-        return value
-
-    return value.startswith(arg)
\ No newline at end of file
+    return value.startswith(arg)
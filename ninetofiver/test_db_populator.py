@@ -1,13 +1,20 @@
 from calendar import monthrange
+from collections import defaultdict
 import datetime
-from itertools import product
+from functools import lru_cache
+from itertools import islice, product
 import logging
+import os
 import random
 
 from dateutil.relativedelta import relativedelta
 from dateutil import tz
 from django.conf import settings
 from django.contrib.auth.models import User, Group
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max, Q
 from django_countries import countries
 
 from ninetofiver.models import (
@@ -41,19 +48,51 @@ from ninetofiver.models import (
     Contract,
     STATUS_PENDING,
     STATUS_APPROVED,
+    UserInfo,
 )
+from ninetofiver.utils import LEAVE_TYPE_NAMES_CACHE_KEY
 
 log = logging.getLogger(__name__)
 
+# Time zone of the generated leave dates and whereabouts
+PRAGUE_TZ = tz.gettz("Europe/Prague")
+
+# Number of rows inserted per query when bulk creating objects
+BULK_BATCH_SIZE = int(os.environ.get("POPULATOR_BATCH", 500))
+
 
 def get_random_date(start_date, end_date):
-    time_between_dates = end_date - start_date
-    days_between_dates = time_between_dates.days
+    return datetime.date.fromordinal(
+        random.randrange(start_date.toordinal(), end_date.toordinal())
+    )
+
+
+@lru_cache(maxsize=None)
+def get_month_days(year, month):
+    """Get all days of the given month."""
+    month_start = datetime.date(year, month, 1)
+    return tuple(
+        month_start + datetime.timedelta(days=day)
+        for day in range(monthrange(year, month)[1])
+    )
 
-    random_number_of_days = random.randrange(days_between_dates)
-    random_date = start_date + datetime.timedelta(days=random_number_of_days)
 
-    return random_date
+def get_random_leave_dates(year, month, length, invalid_dates):
+    """
+    Get a random run of consecutive weekdays of the given length within the given month,
+    none of which are in invalid_dates. Returns an empty tuple if there is no such run.
+    The last day of the month is never used.
+    """
+    days = get_month_days(year, month)[:-1]
+    runs = [
+        days[i:i + length]
+        for i in range(len(days) - length + 1)
+        if all(
+            day.weekday() < 5 and day not in invalid_dates
+            for day in days[i:i + length]
+        )
+    ]
+    return random.choice(runs) if runs else ()
 
 
 def get_random_datetime(start_datetime, end_datetime):
@@ -72,6 +111,29 @@ def xprint(*args, **kwargs):
     print(" ".join(map(str, args)), **kwargs)
 
 
+def chunked(iterable, size):
+    """Yield lists of at most size items from the given iterable."""
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+def bulk_create(model, objs, **kwargs):
+    """
+    Insert the given objects in batches, bypassing save() and its signals.
+    The polymorphic content type save() would set is set here instead.
+    MySQL does not return primary keys, so re-query objects referenced later on.
+    """
+    polymorphic_ctype = ContentType.objects.get_for_model(
+        model, for_concrete_model=False
+    )
+    for obj in objs:
+        obj.polymorphic_ctype = polymorphic_ctype
+    model.objects.bulk_create(objs, batch_size=BULK_BATCH_SIZE, **kwargs)
+
+
 class TestDBPupulator:
     def __init__(self, default_size, perf_tables_size):
         if not settings.DEBUG:
@@ -87,7 +149,6 @@ class TestDBPupulator:
         self.contract_groups = []
         self.contract_log_types = []
         self.contract_roles = []
-        self.contract_users = []
         self.contracts = []
         self.employment_contract = []
         self.employment_contract_type = []
@@ -110,15 +171,18 @@ class TestDBPupulator:
 
     def execute(self):
         """Order of methods is important"""
-        self._populate_basic_tables()
-        self._populate_performance_tables()
-        self._populate_leave_tables()
-        self._populate_additional_tables()
+        # Commit once instead of once per row, this also rolls back a failed run
+        with transaction.atomic():
+            self._populate_basic_tables()
+            self._populate_performance_tables()
+            self._populate_leave_tables()
+            self._populate_additional_tables()
 
     def _populate_basic_tables(self):
         """
         This fills basic tables with data for debugging purposes
         when modifying, make sure to change all lists related to the object
+        rows that already exist, e.g. leave types added in the admin, are kept
         """
         xprint("Populate basic tables")
 
@@ -128,14 +192,20 @@ class TestDBPupulator:
             ("Recup", "recup", True, False),
             ("Unpaid", "unpaid", False, False),
         ]
+        leave_types = []
         for leave_name, leave_desc, leave_overtime, leave_sickness in self.leavetypes:
-            lt = LeaveType(
-                name=leave_name,
-                description=leave_desc,
-                overtime=leave_overtime,
-                sickness=leave_sickness,
+            leave_types.append(
+                LeaveType(
+                    name=leave_name,
+                    description=leave_desc,
+                    overtime=leave_overtime,
+                    sickness=leave_sickness,
+                    order=len(leave_types) + 1,
+                )
             )
-            lt.save()
+        bulk_create(LeaveType, leave_types, ignore_conflicts=True)
+        # bulk_create does not send the post_save signal invalidating the cached names
+        cache.delete(LEAVE_TYPE_NAMES_CACHE_KEY)
         xprint(" - LeaveType:", len(self.leavetypes))
 
         companies_example = [
@@ -156,15 +226,21 @@ class TestDBPupulator:
             company_country,
             company_internal,
         ) in companies_example:
-            com = Company(
-                name=company_name,
-                vat_identification_number=company_vat,
-                address=company_addr,
-                country=company_country,
-                internal=company_internal,
+            self.companies.append(
+                Company(
+                    name=company_name,
+                    vat_identification_number=company_vat,
+                    address=company_addr,
+                    country=company_country,
+                    internal=company_internal,
+                )
             )
-            com.save()
-            self.companies.append(com)
+        bulk_create(Company, self.companies, ignore_conflicts=True)
+        self.companies = list(
+            Company.objects.filter(
+                name__in=[company[0] for company in companies_example]
+            ).order_by("id")
+        )
         xprint(" - Company:", len(self.companies))
 
         locations_examples = [
@@ -177,10 +253,17 @@ class TestDBPupulator:
             "Kraków",
             "Kiev",
         ]
-        for loc_name in locations_examples:
-            loc = Location(name=loc_name)
-            loc.save()
-            self.locations.append(loc)
+        bulk_create(
+            Location,
+            [
+                Location(name=loc_name, order=order)
+                for order, loc_name in enumerate(locations_examples, 1)
+            ],
+            ignore_conflicts=True,
+        )
+        self.locations = list(
+            Location.objects.filter(name__in=locations_examples).order_by("id")
+        )
         xprint(" - Location:", len(self.locations))
 
         perf_types_example = [
@@ -190,11 +273,17 @@ class TestDBPupulator:
             ("Overtime", "overtime", 2.00),
         ]
         for pt_name, pt_description, pt_multiplier in perf_types_example:
-            pt = PerformanceType(
-                name=pt_name, description=pt_description, multiplier=pt_multiplier
+            self.perf_types.append(
+                PerformanceType(
+                    name=pt_name, description=pt_description, multiplier=pt_multiplier
+                )
             )
-            pt.save()
-            self.perf_types.append(pt)
+        bulk_create(PerformanceType, self.perf_types)
+        self.perf_types = list(
+            PerformanceType.objects.filter(
+                name__in=[perf_type[0] for perf_type in perf_types_example]
+            ).order_by("id")
+        )
         xprint(" - PerformanceType:", len(self.perf_types))
 
         work_schedules_example = [
@@ -214,18 +303,24 @@ class TestDBPupulator:
             ws_sat,
             ws_sun,
         ) in work_schedules_example:
-            ws = WorkSchedule(
-                name=ws_name,
-                monday=ws_mon,
-                tuesday=ws_tue,
-                wednesday=ws_wed,
-                thursday=ws_thu,
-                friday=ws_fri,
-                saturday=ws_sat,
-                sunday=ws_sun,
+            self.work_schedules.append(
+                WorkSchedule(
+                    name=ws_name,
+                    monday=ws_mon,
+                    tuesday=ws_tue,
+                    wednesday=ws_wed,
+                    thursday=ws_thu,
+                    friday=ws_fri,
+                    saturday=ws_sat,
+                    sunday=ws_sun,
+                )
             )
-            ws.save()
-            self.work_schedules.append(ws)
+        bulk_create(WorkSchedule, self.work_schedules, ignore_conflicts=True)
+        self.work_schedules = list(
+            WorkSchedule.objects.filter(
+                name__in=[work_schedule[0] for work_schedule in work_schedules_example]
+            ).order_by("id")
+        )
         xprint(" - WorkSchedule:", len(self.work_schedules))
 
     def _populate_performance_tables(self):
@@ -243,10 +338,11 @@ class TestDBPupulator:
             self.contract_roles.append(cr)
         # For more information about when and how to use bulk_create method follow the link:
         # https://docs.djangoproject.com/en/4.0/ref/models/querysets/#bulk-create
-        ContractRole.objects.bulk_create(self.contract_roles)
+        bulk_create(ContractRole, self.contract_roles)
         xprint(" - ContractRole:", len(self.contract_roles))
 
         # Its ok to have smaller no. of records for these tables
+        companies = []
         for i in self.default_range:
             usr = User(
                 username="test_user_" + str(i),
@@ -255,7 +351,6 @@ class TestDBPupulator:
                 last_name="Inuit",
                 is_active=random.choice([True, True, True, False]),
             )
-            usr.save()
             self.users.append(usr)
             country = random.choice(["CZ", "BE", "PL"])
             comp = Company(
@@ -265,9 +360,9 @@ class TestDBPupulator:
                 country=country,
                 internal=True,
             )
-            comp.full_clean()
-            comp.save()
-            self.companies.append(comp)
+            # uniqueness is guaranteed by the names, so skip its queries
+            comp.full_clean(validate_unique=False)
+            companies.append(comp)
 
             comp_cust = Company(
                 vat_identification_number=(country + "000" + str(i)),
@@ -276,14 +371,43 @@ class TestDBPupulator:
                 country=country,
                 internal=False,
             )
-            comp_cust.full_clean()
-            comp_cust.save()
+            comp_cust.full_clean(validate_unique=False)
             self.companies_customers.append(comp_cust)
 
             cg = ContractGroup(name="test_contract_group_" + str(i))
-            cg.save()
             self.contract_groups.append(cg)
 
+        User.objects.bulk_create(self.users, batch_size=BULK_BATCH_SIZE)
+        bulk_create(Company, companies)
+        bulk_create(Company, self.companies_customers)
+        bulk_create(ContractGroup, self.contract_groups)
+
+        # bulk_create does not send the post_save signal creating the user info
+        test_users = User.objects.filter(username__startswith="test_user_")
+        bulk_create(
+            UserInfo,
+            [
+                UserInfo(
+                    user=user,
+                    country=random.choice(["CZ", "BE", "PL"]),
+                    gender=random.choice(["m", "f"]),
+                    birth_date=get_random_date(
+                        datetime.date(1970, 1, 1), datetime.date(2005, 1, 1)
+                    ),
+                )
+                for user in test_users.order_by("id")
+            ],
+        )
+        self.users = list(test_users.select_related("userinfo").order_by("id"))
+        self.companies += Company.objects.filter(
+            name__startswith="test_company_", internal=True
+        ).order_by("id")
+        self.companies_customers = list(
+            Company.objects.filter(name__startswith="test_company_customer_").order_by(
+                "id"
+            )
+        )
+
         xprint(" - User:", len(self.users))
         xprint(" - Company:", len(self.companies))
         xprint(" - ContractGroup:", len(self.contract_groups))
@@ -292,12 +416,6 @@ class TestDBPupulator:
         staff_group = Group(name="staff")
         staff_group.save()
         
-        # add userinfo
-        for user in self.users:
-            user.userinfo.country = random.choice(["CZ", "BE", "PL"])
-            user.userinfo.gender = random.choice(["m", "f"])
-            user.userinfo.save(update_fields=["country", "gender"])
-
         # Create staff users
         staff_users = [
             ("PavelTom", "pavel.tom@email.cz", "Pavel", "Tom", 1, 1, "CZ", "m"),
@@ -306,6 +424,7 @@ class TestDBPupulator:
             ("JeroenTux", "jeroen.tux@email.be", "Jeroen", "Tux", 1, 1, "BE", "m"),
             ("JakubMuz", "jakub.muz@email.pl", "Jakub", "Muz", 1, 0, "PL", "m"),
         ]
+        staff = []
         for (
             username,
             email,
@@ -316,74 +435,81 @@ class TestDBPupulator:
             country,
             gender,
         ) in staff_users:
-            user = User(
-                username=username,
-                email=email,
-                first_name=first_name,
-                last_name=last_name,
-                is_staff=is_staff,
-                is_active=is_active,
+            staff.append(
+                User(
+                    username=username,
+                    email=email,
+                    first_name=first_name,
+                    last_name=last_name,
+                    is_staff=is_staff,
+                    is_active=is_active,
+                )
             )
-            user.save()
-            user.groups.add(staff_group)
-            self.users.append(user)
-            user.userinfo.country = country
-            user.userinfo.gender = gender
-            user.userinfo.save()
-
-        # add birth_date to users in user_info table
-        for user in self.users:
-            user.userinfo.birth_date = get_random_date(
-                datetime.date(1970, 1, 1), datetime.date(2005, 1, 1)
+        User.objects.bulk_create(staff, batch_size=BULK_BATCH_SIZE)
+        staff = User.objects.filter(
+            username__in=[staff_user[0] for staff_user in staff_users]
+        ).order_by("id")
+
+        user_infos = []
+        user_groups = []
+        for user, staff_user in zip(staff, staff_users):
+            country, gender = staff_user[-2:]
+            user_infos.append(
+                UserInfo(
+                    user=user,
+                    country=country,
+                    gender=gender,
+                    birth_date=get_random_date(
+                        datetime.date(1970, 1, 1), datetime.date(2005, 1, 1)
+                    ),
+                )
             )
-            user.userinfo.save(update_fields=["birth_date"])
+            user_groups.append(User.groups.through(user=user, group=staff_group))
+        bulk_create(UserInfo, user_infos)
+        # skips m2m_changed, which is fine as the new group has no contract user groups
+        User.groups.through.objects.bulk_create(user_groups, ignore_conflicts=True)
+        self.users += staff.select_related("userinfo")
 
         # populate contracts & activity performances -> higher number of records is good
+        starts_at_range = (datetime.date(2017, 1, 1), datetime.date(2021, 1, 1))
+        ends_at_range = (datetime.date(2021, 9, 9), datetime.date(2030, 1, 1))
+        # draw the customers and companies of all 3 contract types at once
+        contract_count = 3 * len(self.perf_tables_range)
+        customers = iter(random.choices(self.companies_customers, k=contract_count))
+        companies = iter(random.choices(self.companies, k=contract_count))
         for x in self.perf_tables_range:
-            start = get_random_date(
-                datetime.date(2017, 1, 1), datetime.date(2021, 1, 1)
-            )
-            end = get_random_date(datetime.date(2021, 9, 9), datetime.date(2030, 1, 1))
+            start = get_random_date(*starts_at_range)
+            end = get_random_date(*ends_at_range)
             proj_cont = ProjectContract(
                 name="test_project_contract_" + str(x),
                 description="Test project contract " + str(x),
-                customer=self.companies_customers[
-                    random.randrange(len(self.companies_customers))
-                ],
-                company=self.companies[random.randrange(len(self.companies))],
+                customer=next(customers),
+                company=next(companies),
                 starts_at=start,
                 ends_at=end,
                 active=1,
                 fixed_fee=round(random.uniform(200, 1000), 2),
             )
-            start = get_random_date(
-                datetime.date(2017, 1, 1), datetime.date(2021, 1, 1)
-            )
-            end = get_random_date(datetime.date(2021, 9, 9), datetime.date(2030, 1, 1))
+            start = get_random_date(*starts_at_range)
+            end = get_random_date(*ends_at_range)
             cons_cont = ConsultancyContract(
                 name="test_consultancy_contract_" + str(x),
                 description="Test consultancy contract " + str(x),
-                customer=self.companies_customers[
-                    random.randrange(len(self.companies_customers))
-                ],
-                company=self.companies[random.randrange(len(self.companies))],
+                customer=next(customers),
+                company=next(companies),
                 starts_at=start,
                 ends_at=end,
                 active=1,
                 duration=round(random.uniform(10, 100), 1),
                 day_rate=round(random.uniform(10, 100), 2),
             )
-            start = get_random_date(
-                datetime.date(2017, 1, 1), datetime.date(2021, 1, 1)
-            )
-            end = get_random_date(datetime.date(2021, 9, 9), datetime.date(2030, 1, 1))
+            start = get_random_date(*starts_at_range)
+            end = get_random_date(*ends_at_range)
             supp_cont = SupportContract(
                 name="test_support_contract_" + str(x),
                 description="Test support contract " + str(x),
-                customer=self.companies_customers[
-                    random.randrange(len(self.companies_customers))
-                ],
-                company=self.companies[random.randrange(len(self.companies))],
+                customer=next(customers),
+                company=next(companies),
                 starts_at=start,
                 ends_at=end,
                 active=1,
@@ -391,6 +517,7 @@ class TestDBPupulator:
                 fixed_fee=round(random.uniform(200, 1000), 2),
             )
 
+            # bulk_create does not support multi-table inherited models like these
             proj_cont.save()
             cons_cont.save()
             supp_cont.save()
@@ -400,33 +527,32 @@ class TestDBPupulator:
         xprint(" - Contract:", len(self.contracts))
 
         # add contract users - all have Cotract role 1
-        self.contract_roles = ContractRole.objects.all()
-        for item in product(self.users, self.contracts):
-            cu = ContractUser(
-                user=item[0],
-                contract=item[1],
-                contract_role=self.contract_roles[0],
-            )
-            self.contract_users.append(cu)
-        ContractUser.objects.bulk_create(self.contract_users)
-        xprint(" - ContractUser:", len(self.contract_users))
+        self.contract_roles = list(ContractRole.objects.all())
+        contract_role = self.contract_roles[0]
+        # stream the users x contracts cross product instead of keeping it in memory
+        contract_users = (
+            ContractUser(user=user, contract=contract, contract_role=contract_role)
+            for user, contract in product(self.users, self.contracts)
+        )
+        for chunk in chunked(contract_users, BULK_BATCH_SIZE):
+            bulk_create(ContractUser, chunk, ignore_conflicts=True)
+        xprint(" - ContractUser:", len(self.users) * len(self.contracts))
 
         self.create_timesheets()
 
         # add performance
         # 10 for every timesheet, random contracts
+        # ActivityPerformance is multi-table inherited, bulk_create does not support it
+        performance_type = self.perf_types[1]
         for ts in self.timesheets:
+            days = get_month_days(ts.year, ts.month)
             for x in range(1, 11):
-                days_in_month = monthrange(ts.year, ts.month)[1]
-
                 act_perf = ActivityPerformance(
                     timesheet=ts,
-                    date=datetime.date(
-                        ts.year, ts.month, random.randint(1, days_in_month)
-                    ),
+                    date=random.choice(days),
                     contract=self.contracts[random.randrange(len(self.contracts))],
-                    performance_type=self.perf_types[1],
-                    contract_role=self.contract_roles[0],
+                    performance_type=performance_type,
+                    contract_role=contract_role,
                     description="test_activity_performance_" + str(x),
                     duration=random.randrange(1, 9),
                 )
@@ -436,208 +562,123 @@ class TestDBPupulator:
 
         # change Contracts with end_at before today as inactive
         # has to be done after creating Performances - it can not be created on inactive Contract
-        contracts = Contract.objects.all()
-        for contract in contracts:
-            if contract.ends_at < datetime.date.today():
-                contract.active = 0
-                contract.save(update_fields=["active"])
+        Contract.objects.filter(ends_at__lt=datetime.date.today()).update(active=0)
 
     def create_timesheets(self):
         """Create a new timesheet for the current month for each user."""
         today = datetime.date.today()
         next_month = datetime.date.today() + relativedelta(months=1)
 
-        for user in self.users:
-            if user.is_active:
-                # Ensure timesheet for this month exists
-                ts_this_month, _ = Timesheet.objects.get_or_create(
-                    user=user, month=today.month, year=today.year
-                )
-
-                # Ensure timesheet for next month exists
-                ts_next_month, _ = Timesheet.objects.get_or_create(
-                    user=user, month=next_month.month, year=next_month.year
-                )
+        active_users = [user for user in self.users if user.is_active]
+        timesheets = Timesheet.objects.filter(
+            Q(month=today.month, year=today.year)
+            | Q(month=next_month.month, year=next_month.year),
+            user__in=active_users,
+        )
+        existing = set(timesheets.values_list("user_id", "month", "year"))
+
+        # Ensure timesheets for this month and next month exist
+        missing = []
+        for user in active_users:
+            for date in (today, next_month):
+                if (user.id, date.month, date.year) not in existing:
+                    missing.append(
+                        Timesheet(user=user, month=date.month, year=date.year)
+                    )
+        bulk_create(Timesheet, missing, ignore_conflicts=True)
 
-                self.timesheets.append(ts_this_month)
-                self.timesheets.append(ts_next_month)
+        self.timesheets = list(timesheets.order_by("user_id", "year", "month"))
         xprint(" - Timesheet:", len(self.timesheets))
 
     def _populate_leave_tables(self):
         # Add holidays
         xprint("Populate holiday tables")
-        holiday_dates = []
-        for x in range(1000):
-            holiday_date = get_random_date(
-                datetime.date(2017, 1, 1), datetime.date(2030, 1, 1)
+        holiday_dates = [
+            datetime.date.fromordinal(ordinal)
+            for ordinal in random.choices(
+                range(
+                    datetime.date(2017, 1, 1).toordinal(),
+                    datetime.date(2030, 1, 1).toordinal(),
+                ),
+                k=1000,
             )
-            holiday_dates.append(holiday_date)
-            ho = Holiday(
+        ]
+        self.holidays = [
+            Holiday(
                 name="Holiday " + str(x),
                 date=holiday_date,
                 country=random.choice(["CZ", "BE", "PL"]),
             )
-            ho.save()
-            self.holidays.append(ho)
+            for x, holiday_date in enumerate(holiday_dates)
+        ]
+        bulk_create(Holiday, self.holidays)
         xprint(" - Holidays:", len(self.holidays))
 
         # Add leaves
         xprint("Populate leave tables")
+        leave_types_by_name = {lt.name: lt for lt in LeaveType.objects.all()}
+        # load all timesheets per user
+        timesheets_by_user = defaultdict(list)
+        for ts in Timesheet.objects.filter(user__in=self.users):
+            timesheets_by_user[ts.user_id].append(ts)
+        now = datetime.datetime.now(tz=PRAGUE_TZ)
+        leaves_example = [
+            ("Vacation", "#test - vacation half day", 1, 13),
+            ("Vacation", "#test - vacation 3 days", 3, 17),
+            ("Sickness", "#test - sickness", 1, 17),
+        ]
         for usr in self.users:
             if usr.is_active:
-                # load all timesheets for user
-                timesheets_for_user = Timesheet.objects.filter(user=usr)
+                timesheets_for_user = timesheets_by_user[usr.id]
                 # invalid days are holidays
-                invalid_dates = list(holiday_dates)
+                invalid_dates = set(holiday_dates)
 
-                # Vacation half day
-                lv1 = Leave(
-                    user=usr,
-                    leave_type=LeaveType.objects.get(name="Vacation"),
-                    description="#test - vacation half day",
-                )
-                lv1.save()
-                self.leaves.append(lv1)
-                # select randomly one timesheet for user
-                ts = timesheets_for_user[random.randrange(len(timesheets_for_user))]
-                searching_for_date = True
-                while searching_for_date:
-                    date_vacation = get_random_date(
-                        datetime.datetime(
-                            ts.year, ts.month, 1, tzinfo=tz.gettz("Europe/Prague")
-                        ),
-                        datetime.datetime(
-                            ts.year, ts.month, 1, tzinfo=tz.gettz("Europe/Prague")
-                        )
-                        + relativedelta(months=1)
-                        - datetime.timedelta(days=1),
+                for leave_name, leave_desc, leave_days, end_hour in leaves_example:
+                    # select randomly one timesheet for user
+                    ts = random.choice(timesheets_for_user)
+                    leave_dates = get_random_leave_dates(
+                        ts.year, ts.month, leave_days, invalid_dates
                     )
-                    weekday = date_vacation.weekday()
-                    saturday = 5
-                    if weekday < saturday and (date_vacation.date() not in invalid_dates):
-                        invalid_dates.append(date_vacation.date())
-                        ld1 = LeaveDate(
-                            leave=lv1,
-                            timesheet=ts,
-                            starts_at=date_vacation.replace(
-                                hour=9, minute=00, second=1
-                            ),
-                            ends_at=date_vacation.replace(
-                                hour=13, minute=00, second=00
-                            ),
-                        )
-                        ld1.save()
-                        self.leavedates.append(ld1)
-                        break
-                lv1.status = (
-                    STATUS_APPROVED
-                    if ld1.starts_at
-                    < datetime.datetime.now(tz=tz.gettz("Europe/Prague"))
-                    else STATUS_PENDING
-                )
-                lv1.save(update_fields=["status"])
-
-                # Vacation 3 days
-                lv2 = Leave(
-                    user=usr,
-                    leave_type=LeaveType.objects.get(name="Vacation"),
-                    description="#test - vacation 3 days",
-                )
-                lv2.save()
-                self.leaves.append(lv2)
-                # select randomly one timesheet for user
-                ts = timesheets_for_user[random.randrange(len(timesheets_for_user))]
-                searching_for_date = True
-                while searching_for_date:
-                    dates_vacation = []
-                    date1_vacation = get_random_date(
-                        datetime.datetime(
-                            ts.year, ts.month, 1, tzinfo=tz.gettz("Europe/Prague")
-                        ),
-                        datetime.datetime(
-                            ts.year, ts.month, 1, tzinfo=tz.gettz("Europe/Prague")
-                        )
-                        + relativedelta(months=1)
-                        - datetime.timedelta(days=3),
-                    )
-                    dates_vacation.append(date1_vacation)
-                    date2_vacation = date1_vacation + relativedelta(days=1)
-                    dates_vacation.append(date2_vacation)
-                    date3_vacation = date1_vacation + relativedelta(days=2)
-                    dates_vacation.append(date3_vacation)
-                    weekday = date1_vacation.weekday()
-                    thursday = 3
-                    if (
-                        weekday < thursday
-                        and (date1_vacation.date() not in invalid_dates)
-                        and (date2_vacation.date() not in invalid_dates)
-                        and (date3_vacation.date() not in invalid_dates)
-                    ):
-                        for date in dates_vacation:
-                            invalid_dates.append(date.date())
-                            ld2 = LeaveDate(
-                                leave=lv2,
-                                timesheet=ts,
-                                starts_at=date.replace(hour=9, minute=00, second=1),
-                                ends_at=date.replace(hour=17, minute=00, second=00),
-                            )
-                            ld2.save()
-                            self.leavedates.append(ld2)
-                        break
-                lv2.status = (
-                    STATUS_APPROVED
-                    if ld2.starts_at
-                    < datetime.datetime.now(tz=tz.gettz("Europe/Prague"))
-                    else STATUS_PENDING
-                )
-                lv2.save(update_fields=["status"])
-
-                # Sickness
-                lv3 = Leave(
-                    user=usr,
-                    leave_type=LeaveType.objects.get(name="Sickness"),
-                    description="#test - sickness",
-                )
-                lv3.save()
-                self.leaves.append(lv3)
-                # select randomly one timesheet for user
-                ts = timesheets_for_user[random.randrange(len(timesheets_for_user))]
-                while searching_for_date:
-                    date_sickness = get_random_date(
-                        datetime.datetime(
-                            ts.year, ts.month, 1, tzinfo=tz.gettz("Europe/Prague")
-                        ),
-                        datetime.datetime(
-                            ts.year, ts.month, 1, tzinfo=tz.gettz("Europe/Prague")
-                        )
-                        + relativedelta(months=1)
-                        - datetime.timedelta(days=1),
+                    if not leave_dates:
+                        continue
+                    invalid_dates.update(leave_dates)
+
+                    lv = Leave(
+                        user=usr,
+                        leave_type=leave_types_by_name[leave_name],
+                        description=leave_desc,
                     )
-                    weekday = date_sickness.weekday()
-                    saturday = 5
-                    if weekday < saturday and (date_sickness.date() not in invalid_dates):
-                        invalid_dates.append(date_sickness.date())
-                        ld3 = LeaveDate(
-                            leave=lv3,
+                    self.leaves.append(lv)
+                    for date in leave_dates:
+                        ld = LeaveDate(
+                            leave=lv,
                             timesheet=ts,
-                            starts_at=date_sickness.replace(
-                                hour=9, minute=00, second=1
+                            starts_at=datetime.datetime.combine(
+                                date, datetime.time(9, 0, 1), tzinfo=PRAGUE_TZ
                             ),
-                            ends_at=date_sickness.replace(
-                                hour=17, minute=00, second=00
+                            ends_at=datetime.datetime.combine(
+                                date, datetime.time(end_hour), tzinfo=PRAGUE_TZ
                             ),
                         )
-                        ld3.save()
-                        self.leavedates.append(ld3)
-                        break
-                lv3.status = (
-                    STATUS_APPROVED
-                    if ld3.starts_at
-                    < datetime.datetime.now(tz=tz.gettz("Europe/Prague"))
-                    else STATUS_PENDING
-                )
-                lv3.save(update_fields=["status"])
+                        self.leavedates.append(ld)
+                    lv.status = (
+                        STATUS_APPROVED if ld.starts_at < now else STATUS_PENDING
+                    )
 
+        last_leave_pk = Leave.objects.aggregate(Max("id"))["id__max"] or 0
+        bulk_create(Leave, self.leaves)
+        # the leave dates reference the leaves, which need their primary keys first
+        leave_pks = list(
+            Leave.objects.filter(
+                id__gt=last_leave_pk, description__startswith="#test - "
+            )
+            .order_by("id")
+            .values_list("pk", flat=True)
+        )
+        assert len(leave_pks) == len(self.leaves), "Could not recover leave PKs"
+        for leave, leave_pk in zip(self.leaves, leave_pks):
+            leave.pk = leave_pk
+        bulk_create(LeaveDate, self.leavedates)
         xprint(" - Leave:", len(self.leaves))
         xprint(" - LeaveDate:", len(self.leavedates))
 
@@ -649,8 +690,8 @@ class TestDBPupulator:
                 name="API test key " + str(i),
                 user=user,
             )
-            ak.save()
             self.api_keys.append(ak)
+        bulk_create(ApiKey, self.api_keys)
         xprint(" - ApiKey:", len(self.api_keys))
 
         # in one loop ContractLogType, EmploymentContractType, Whereabout
@@ -658,13 +699,11 @@ class TestDBPupulator:
             clt = ContractLogType(
                 name="Contract log type " + str(i),
             )
-            clt.save()
             self.contract_log_types.append(clt)
 
             ect = EmploymentContractType(
                 name="Employment contract type " + str(i),
             )
-            ect.save()
             self.employment_contract_type.append(ect)
 
             tsheet = self.timesheets[i % len(self.timesheets)]
@@ -680,7 +719,7 @@ class TestDBPupulator:
                         random_day,
                         0,
                         0,
-                        tzinfo=tz.gettz("Europe/Prague"),
+                        tzinfo=PRAGUE_TZ,
                     ),
                     datetime.datetime(
                         tsheet.year,
@@ -688,7 +727,7 @@ class TestDBPupulator:
                         random_day,
                         11,
                         59,
-                        tzinfo=tz.gettz("Europe/Prague"),
+                        tzinfo=PRAGUE_TZ,
                     ),
                 ),
                 ends_at=get_random_datetime(
@@ -698,7 +737,7 @@ class TestDBPupulator:
                         random_day,
                         12,
                         0,
-                        tzinfo=tz.gettz("Europe/Prague"),
+                        tzinfo=PRAGUE_TZ,
                     ),
                     datetime.datetime(
                         tsheet.year,
@@ -706,12 +745,19 @@ class TestDBPupulator:
                         random_day,
                         23,
                         59,
-                        tzinfo=tz.gettz("Europe/Prague"),
+                        tzinfo=PRAGUE_TZ,
                     ),
                 ),
             )
-            wa.save()
             self.whereabouts.append(wa)
+        bulk_create(ContractLogType, self.contract_log_types)
+        bulk_create(EmploymentContractType, self.employment_contract_type)
+        bulk_create(Whereabout, self.whereabouts)
+        self.employment_contract_type = list(
+            EmploymentContractType.objects.filter(
+                name__startswith="Employment contract type "
+            ).order_by("id")
+        )
 
         xprint(" - ContractLogType:", len(self.contract_log_types))
         xprint(" - EmploymentContractType:", len(self.employment_contract_type))
@@ -719,7 +765,13 @@ class TestDBPupulator:
 
         # Create Employment contracts - user has to have at least one active contract with internal company
 
-        companies_internal = Company.objects.filter(internal=True)
+        companies_internal = list(Company.objects.filter(internal=True))
+        inuits_by_country = {
+            company.country.code: company
+            for company in Company.objects.filter(
+                name__in=["Inuits CZ", "Inuits BE", "Inuits PL"]
+            )
+        }
         for i, user in enumerate(self.users):
             company_index = i % len(companies_internal)
             company = companies_internal[company_index]
@@ -728,15 +780,7 @@ class TestDBPupulator:
             ]  # grab another company so we can create an expired contract
 
             if user.is_staff:
-                company = (
-                    Company.objects.get(name="Inuits CZ")
-                    if user.userinfo.country == "CZ"
-                    else Company.objects.get(name="Inuits BE")
-                    if user.userinfo.country == "BE"
-                    else Company.objects.get(name="Inuits PL")
-                    if user.userinfo.country == "PL"
-                    else company
-                )
+                company = inuits_by_country.get(user.userinfo.country.code, company)
             ec = EmploymentContract(
                 user=user,
                 company=company,
@@ -751,7 +795,6 @@ class TestDBPupulator:
                     datetime.date(2024, 2, 2), datetime.date(2030, 1, 1)
                 ),
             )
-            ec.save()
 
             # create expirated employment contract
             ec_exp = EmploymentContract(
@@ -768,11 +811,12 @@ class TestDBPupulator:
                     datetime.date(2018, 2, 2), datetime.date(2021, 1, 1)
                 ),
             )
-            ec_exp.save()
             self.employment_contract.append(ec)
             self.employment_contract.append(ec_exp)
+        bulk_create(EmploymentContract, self.employment_contract)
         xprint(" - EmploymentContract:", len(self.employment_contract))
 
+        contract_role = self.contract_roles[0]
         for contract in self.contracts:
             inv = Invoice(
                 contract=contract,
@@ -788,47 +832,55 @@ class TestDBPupulator:
                 reference=f"Reference {contract.id}",
                 description=f"Customer {contract.customer.id}",
             )
-            inv.save()
             self.invoices.append(inv)
 
             con_est = ContractEstimate(
                 contract=contract,
-                contract_role=self.contract_roles[0],
+                contract_role=contract_role,
                 duration=random.randrange(1, 100),
             )
-            con_est.save()
             self.contract_estimates.append(con_est)
+        bulk_create(Invoice, self.invoices)
+        bulk_create(ContractEstimate, self.contract_estimates)
+        self.invoices = list(
+            Invoice.objects.filter(contract__in=self.contracts).order_by("id")
+        )
 
         xprint(" - Invoice:", len(self.invoices))
         xprint(" - ContractEstimate:", len(self.contract_estimates))
 
-        for item in self.invoices:
-            inv_item = InvoiceItem(
+        self.invoice_items = [
+            InvoiceItem(
                 invoice=item,
                 price=random.randrange(10, 100),
                 amount=random.randrange(1, 3),
                 description=f"Description {item.id}",
             )
-            inv_item.save()
-            self.invoice_items.append(inv_item)
+            for item in self.invoices
+        ]
+        bulk_create(InvoiceItem, self.invoice_items)
         xprint(" - InvoiceItem:", len(self.invoice_items))
 
+        country_codes = [country_code for country_code, country_name in countries]
         for i in range(1, 11):
             tt = TrainingType(
                 name="Training type " + str(i),
-                country=(list(countries)[random.randrange(len(countries))])[
-                    0
-                ],  # random country code from countries
+                country=random.choice(country_codes),
                 description="Description of training type",
             )
-            tt.save()
             self.training_types.append(tt)
+        bulk_create(TrainingType, self.training_types)
+        self.training_types = list(
+            TrainingType.objects.filter(name__startswith="Training type ").order_by(
+                "id"
+            )
+        )
         xprint(" - TrainingType:", len(self.training_types))
 
-        for user in self.users:
-            ut = UserTraining(user=user)
-            ut.save()
-            self.user_trainings.append(ut)
+        bulk_create(UserTraining, [UserTraining(user=user) for user in self.users])
+        self.user_trainings = list(
+            UserTraining.objects.filter(user__in=self.users).order_by("id")
+        )
         xprint(" - UserTraining:", len(self.user_trainings))
 
         for i in range(1, 20):
@@ -836,8 +888,8 @@ class TestDBPupulator:
                 user_training=random.choice(self.user_trainings),
                 training_type=random.choice(self.training_types),
             )
-            training.save()
             self.trainings.append(training)
+        bulk_create(Training, self.trainings)
         xprint(" - Training:", len(self.trainings))
 
         xprint("Populator complete!")
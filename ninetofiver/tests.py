@@ -1,9 +1,10 @@
+from django.test import SimpleTestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 from rest_assured import testcases
 from django.utils.timezone import utc
-from ninetofiver import factories, models
+from ninetofiver import factories, models, tables
 from decimal import Decimal
 from datetime import timedelta
 import logging
@@ -246,3 +247,54 @@ class AdminReportViewTests(AuthenticatedAPITestCase):
         """Test the project contract budget overview report view."""
         response = self.client.get(reverse('admin_report_project_contract_budget_overview'))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class TableRenderingTests(SimpleTestCase):
+    """Table rendering tests."""
+
+    def test_euro_column_render(self):
+        """Test rendering euro amounts the same way humanize.intcomma did."""
+        column = tables.EuroColumn()
+        self.assertEqual(column.render(1234), '€ 1,234')
+        self.assertEqual(column.render(-1500), '€ -1,500')
+        self.assertEqual(column.render(1234.5), '€ 1,234.5')
+        self.assertEqual(column.render(Decimal('1234567.50')), '€ 1,234,567.50')
+        self.assertEqual(column.render(0), '<span style="color:#999;">€ 0</span>')
+        self.assertEqual(column.render(None), '<span style="color:#999;">€ 0</span>')
+
+    def test_format_euro(self):
+        """Test formatting euro amounts."""
+        self.assertEqual(tables._format_euro(1234567), '€ 1,234,567')
+        self.assertEqual(tables._format_euro(Decimal('12.30')), '€ 12.30')
+        self.assertEqual(tables._format_euro(0), '€ 0')
+        self.assertEqual(tables._format_euro(None), '€ 0')
+
+    def test_buttons(self):
+        """Test joining button HTML, leaving out empty buttons."""
+        self.assertEqual(tables._buttons('<a>A</a>', '', None, '<a>B</a>'), '<a>A</a>&nbsp;<a>B</a>')
+        self.assertEqual(tables._buttons('<a>A</a>', '<a>B</a>', separator='<br><br>'), '<a>A</a><br><br><a>B</a>')
+        self.assertEqual(tables._buttons(), '')
+
+    def test_actions_column_render(self):
+        """Test rendering action buttons the same way joining the button HTML by hand did."""
+        table = tables.UserOvertimeOverviewTable([])
+        html = table.render_actions({'year': 2020, 'month': 2, 'user': factories.UserFactory.build(id=3)})
+        self.assertHTMLEqual(html, '<a class="button" href="%s?user=3&from_date=2020-02-01&until_date=2020-02-29">'
+                                   'Details</a>' % reverse('admin_report_user_range_info'))
+
+    def test_summed_column_footers(self):
+        """Test rendering the totals of summed columns in their footers."""
+        class SummedTable(tables.BaseTable):
+            hours = tables.SummedHoursColumn()
+            amount = tables.SummedEuroColumn()
+            empty_amount = tables.SummedEuroColumn()
+
+        table = SummedTable([
+            {'hours': Decimal('2.5'), 'amount': Decimal('1000.25'), 'empty_amount': None},
+            {'hours': Decimal('1.5'), 'amount': None, 'empty_amount': 0},
+            {'hours': None, 'amount': 500, 'empty_amount': None},
+        ])
+        self.assertHTMLEqual(table.columns['hours'].footer, 'Total: 4.00h (0.50d)')
+        self.assertHTMLEqual(table.columns['amount'].footer, '<div align="right">Total: € 1,500.25</div>')
+        self.assertHTMLEqual(table.columns['empty_amount'].footer,
+                             '<div align="right">Total: <span style="color:#999;">€ 0</span></div>')
@@ -97,9 +97,6 @@ urlpatterns += [
         name='registration_disallowed',
     ),
 
-    # Silk (profiling)
-    path('admin/silk/', include('silk.urls', namespace='silk')),
-
     # Custom admin routes
     re_path(r'^admin/ninetofiver/leave/approve/(?P<leave_pk>[0-9,]+)/$', views.admin_leave_approve_view, name='admin_leave_approve'),  # noqa
     re_path(r'^admin/ninetofiver/leave/reject/(?P<leave_pk>[0-9,]+)/$', views.admin_leave_reject_view, name='admin_leave_reject'),  # noqa
@@ -136,6 +133,12 @@ urlpatterns += [
         name='contract-autocomplete',),
 ]
 
+if 'silk' in settings.INSTALLED_APPS:
+    urlpatterns += [
+        # Silk (profiling)
+        path('admin/silk/', include('silk.urls', namespace='silk')),
+    ]
+
 
 # if settings.DEBUG:
 #     import debug_toolbar
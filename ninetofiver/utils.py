@@ -6,12 +6,14 @@ from calendar import monthrange
 from importlib import import_module
 
 from dateutil.relativedelta import relativedelta
+from django.core.cache import cache
 from django.core.mail import send_mail as base_send_mail
 from django.db.models import Q
 from django.template.loader import render_to_string
 from import_export.widgets import ManyToManyWidget
 
 DEFAULT_DJANGO_ENVIRONMENT = 'dev'
+LEAVE_TYPE_NAMES_CACHE_KEY = 'leave_type_names'
 
 
 def get_django_environment():
@@ -32,6 +34,11 @@ def get_django_configuration():
     return env_map.get(env, 'Dev')
 
 
+def get_compiled_cfg_file_path(cfg_file_path):
+    """Get the path of the Python module compiled from the given YAML configuration file."""
+    return '%s.py' % os.path.splitext(cfg_file_path)[0]
+
+
 def str_import(string):
     """Import a class from a string."""
     module, attr = string.rsplit('.', maxsplit=1)
@@ -120,6 +127,17 @@ def get_users_with_permission(permission):
     return users
 
 
+def get_leave_type_names():
+    """Get the names of all leave types ordered by name, cached until a leave type changes."""
+    from ninetofiver import models
+
+    return cache.get_or_set(
+        LEAVE_TYPE_NAMES_CACHE_KEY,
+        lambda: list(models.LeaveType.objects.order_by('name').values_list('name', flat=True)),
+        None,
+    )
+
+
 class IntelligentManyToManyWidget(ManyToManyWidget):
     """
     Same as parent widget, but you can pass lookup key.
@@ -11,7 +11,7 @@ from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import models as auth_models, mixins as auth_mixins
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models import Q, F, Sum, Max, DecimalField
+from django.db.models import Q, F, Sum, Max, DecimalField, Prefetch
 from django.forms.models import modelform_factory
 from django.shortcuts import get_object_or_404
 from django.shortcuts import render, redirect
@@ -524,12 +524,16 @@ def admin_report_timesheet_overview_view(request):
                                          user__employmentcontract__company__id=company))
 
     data = []
+    today = datetime.now().date()
     for timesheet in timesheets:
         date_range = timesheet.get_date_range()
         range_info = calculation.get_range_info([timesheet.user], date_range[0], date_range[1])
         range_info = range_info[timesheet.user.id]
-        range_info_to_day = calculation.get_range_info([timesheet.user], date_range[0], datetime.now().date())
-        range_info_to_day = range_info_to_day[timesheet.user.id]
+        # The "until today" info is only shown for timesheets of the current month
+        range_info_to_day = None
+        if (timesheet.year, timesheet.month) == (today.year, today.month):
+            range_info_to_day = calculation.get_range_info([timesheet.user], date_range[0], today)
+            range_info_to_day = range_info_to_day[timesheet.user.id]
 
         data.append({
             'timesheet': timesheet,
@@ -1172,7 +1176,11 @@ def admin_report_expiring_consultancy_contract_overview_view(request):
     contracts = (
         models.ConsultancyContract.objects.all()
         .select_related('customer')
-        .prefetch_related('contractuser_set', 'contractuser_set__contract_role', 'contractuser_set__user')
+        # Order the prefetched contract users up front, ordering them per contract would query them again
+        .prefetch_related(Prefetch('contractuser_set',
+                                   queryset=(models.ContractUser.objects
+                                             .select_related('user', 'contract_role')
+                                             .order_by('user__first_name', 'user__last_name', 'user__username'))))
         .filter(active=True)
     )
 
@@ -1218,7 +1226,7 @@ def admin_report_expiring_consultancy_contract_overview_view(request):
         data.append({
             'contract': contract,
             'contract_log': contract_log,
-            'users': [contract_user.user for contract_user in contract.contractuser_set.all().order_by('user__first_name', 'user__last_name', 'user__username')],
+            'users': [contract_user.user for contract_user in contract.contractuser_set.all()],
             'alotted_hours': alotted_hours,
             'performed_hours': performed_hours,
             'remaining_hours': remaining_hours,
@@ -1990,7 +1998,8 @@ def admin_report_internal_availability_overview_view(request):
                             issue['internal_status'] = 'red'
 
     config = RequestConfig(request, paginate={'per_page': pagination.CustomizablePageNumberPagination.page_size * 4})
-    table = tables.InternalAvailabilityOverviewTable(date, date, data)
+    # Every user's data holds issues, so there are issues to show as long as there are users
+    table = tables.InternalAvailabilityOverviewTable(date, date, data, has_issues=bool(data))
     config.configure(table)
 
     export_format = request.GET.get('_export', None)